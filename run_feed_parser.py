@@ -2,8 +2,20 @@ import asyncio
 
 from src.core import Core
 from src.rss.feedparser import FeedParser
+from src.rss.http_client import HttpClient
 from src.telegram.bot import TelegramBot
 
+
+async def parse_feeds() -> None:
+    feedparser = FeedParser(TelegramBot())
+    try:
+        await feedparser.parse_feeds()
+        await feedparser.outbox_sender.drain()
+    finally:
+        await HttpClient.close()
+        await TelegramBot.close()
+
+
 if __name__ == "__main__":
     Core.init()
-    asyncio.run(FeedParser(TelegramBot()).parse_feeds())
+    asyncio.run(parse_feeds())
@@ -18,7 +18,39 @@ FILE_DIR: Path = Path(getenv("FILE_DIR", "./files").rstrip("/"))
 LOG_FILE: Path = FILE_DIR / "bot.log"
 DATABASE: Path = FILE_DIR / "sqlite_v4.db"
 PARSE_INTERVAL: int = int(getenv("PARSE_INTERVAL") or 60)
+POLL_MIN_INTERVAL: int = int(getenv("POLL_MIN_INTERVAL") or 30)
+POLL_MAX_INTERVAL: int = int(getenv("POLL_MAX_INTERVAL") or 600)
+POLL_TARGET_DEALS: float = float(getenv("POLL_TARGET_DEALS") or 2)
+POLL_JITTER: float = float(getenv("POLL_JITTER") or 0.1)
+PARSE_WORKERS: int = int(getenv("PARSE_WORKERS") or 1)
+PIPELINE_QUEUE_SIZE: int = int(getenv("PIPELINE_QUEUE_SIZE") or 100)
+PIPELINE_SENDERS: int = int(getenv("PIPELINE_SENDERS") or 4)
+OUTBOX_BATCH_SIZE: int = int(getenv("OUTBOX_BATCH_SIZE") or 500)
+OUTBOX_MAX_ATTEMPTS: int = int(getenv("OUTBOX_MAX_ATTEMPTS") or 3)
+OUTBOX_RETRY_DELAY: int = int(getenv("OUTBOX_RETRY_DELAY") or 60)
+OUTBOX_RETENTION: int = int(getenv("OUTBOX_RETENTION") or 604800)
+BROADCAST_BATCH_SIZE: int = int(getenv("BROADCAST_BATCH_SIZE") or 100)
+TELEGRAM_CONNECTIONS: int = int(getenv("TELEGRAM_CONNECTIONS") or PIPELINE_SENDERS + 4)
+TELEGRAM_GLOBAL_RATE: float = float(getenv("TELEGRAM_GLOBAL_RATE") or 30)
+TELEGRAM_CHAT_RATE: float = float(getenv("TELEGRAM_CHAT_RATE") or 1)
+TELEGRAM_GROUP_RATE: float = float(getenv("TELEGRAM_GROUP_RATE") or 0.33)
+TELEGRAM_CHAT_BUCKETS: int = int(getenv("TELEGRAM_CHAT_BUCKETS") or 10000)
+HTTP_TIMEOUT: int = int(getenv("HTTP_TIMEOUT") or 30)
+HTTP_CONNECT_TIMEOUT: int = int(getenv("HTTP_CONNECT_TIMEOUT") or 10)
+HTTP_CONNECTIONS_PER_HOST: int = int(getenv("HTTP_CONNECTIONS_PER_HOST") or 4)
+HTTP_KEEPALIVE_TIMEOUT: int = int(getenv("HTTP_KEEPALIVE_TIMEOUT") or 120)
 NOTIFICATION_CAP: int = int(getenv("NOTIFICATION_CAP") or 50)
+NOTIFICATION_WINDOW: int = int(getenv("NOTIFICATION_WINDOW") or 3600)
+QUERY_CACHE_SIZE: int = int(getenv("QUERY_CACHE_SIZE") or 50000)
+MATCHING_ENGINE: str = getenv("MATCHING_ENGINE", "index")
+DEAL_CACHE_SIZE: int = int(getenv("DEAL_CACHE_SIZE") or 5000)
+RENDER_CACHE_SIZE: int = int(getenv("RENDER_CACHE_SIZE") or 10000)
+IMAGE_CACHE_SIZE: int = int(getenv("IMAGE_CACHE_SIZE") or 5000)
+IMAGE_CACHE_TTL: int = int(getenv("IMAGE_CACHE_TTL") or 86400)
+SEEN_ITEMS_TTL: int = int(getenv("SEEN_ITEMS_TTL") or 604800)
+SEEN_ITEMS_MAX: int = int(getenv("SEEN_ITEMS_MAX") or 5000)
+SEEN_ITEMS_GRACE: int = int(getenv("SEEN_ITEMS_GRACE") or 3600)
+REGISTRY_CHECK_INTERVAL: int = int(getenv("REGISTRY_CHECK_INTERVAL") or 3600)
 WHITELIST: list[int] = [int(x.strip()) for x in getenv("WHITELIST", "").split(",") if x.strip()]
 BLACKLIST: list[int] = [int(x.strip()) for x in getenv("BLACKLIST", "").split(",") if x.strip()]
 TIMEZONE: tzinfo = timezone(getenv("TIMEZONE", "Europe/Berlin"))
@@ -4,6 +4,7 @@ import sqlite3
 from src import config
 from src.config import DATABASE, FILE_DIR
 from src.db.db_client import DbClient
+from src.db.subscription_registry import SubscriptionRegistry
 
 
 class Core:
@@ -43,6 +44,8 @@ class Core:
             elif (FILE_DIR / "sqlite_v2.db").is_file():
                 cls.migrate_from_v2()
 
+        SubscriptionRegistry.load()
+
     @classmethod
     def migrate_from_v2(cls) -> None:
         with sqlite3.connect(config.DATABASE) as con:
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import time
+from typing import TYPE_CHECKING
+
+from sqlalchemy import func, literal
+from sqlmodel import Session, col, insert, select, update
+
+from src.db.db_client import DbClient
+from src.models import BroadcastModel, BroadcastRecipientModel, RecipientStatus, UserModel
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+
+
+class BroadcastClient(DbClient):
+    @classmethod
+    def create(cls, message_id: int) -> BroadcastModel:
+        with Session(cls._engine) as session:
+            broadcast = BroadcastModel(message_id=message_id, created_at=time.time())
+            session.add(broadcast)
+            session.flush()
+            session.exec(
+                insert(BroadcastRecipientModel).from_select(
+                    ["broadcast_id", "user_id"],
+                    select(literal(broadcast.id), UserModel.id).where(col(UserModel.active)),
+                )
+            )
+            session.commit()
+            session.refresh(broadcast)
+
+            return broadcast
+
+    @classmethod
+    def set_progress_message(cls, broadcast: BroadcastModel, message_id: int) -> BroadcastModel:
+        with Session(cls._engine) as session:
+            broadcast.progress_message_id = message_id
+
+            return cls._update(session, broadcast)
+
+    @classmethod
+    def finish(cls, broadcast: BroadcastModel) -> BroadcastModel:
+        with Session(cls._engine) as session:
+            broadcast.finished_at = time.time()
+
+            return cls._update(session, broadcast)
+
+    @classmethod
+    def fetch_unfinished(cls) -> list[BroadcastModel]:
+        with Session(cls._engine) as session:
+            statement = select(BroadcastModel).where(col(BroadcastModel.finished_at).is_(None))
+
+            return list(session.exec(statement).all())
+
+    @classmethod
+    def fetch_pending_recipients(cls, broadcast_id: int, limit: int) -> list[int]:
+        with Session(cls._engine) as session:
+            statement = (
+                select(BroadcastRecipientModel.user_id)
+                .where(BroadcastRecipientModel.broadcast_id == broadcast_id)
+                .where(BroadcastRecipientModel.status == RecipientStatus.PENDING)
+                .order_by(col(BroadcastRecipientModel.user_id))
+                .limit(limit)
+            )
+
+            return list(session.exec(statement).all())
+
+    @classmethod
+    def save_results(cls, broadcast_id: int, results: Mapping[int, RecipientStatus]) -> None:
+        user_ids_by_status: dict[RecipientStatus, list[int]] = {}
+        for user_id, status in results.items():
+            user_ids_by_status.setdefault(status, []).append(user_id)
+
+        with Session(cls._engine) as session:
+            for status, user_ids in user_ids_by_status.items():
+                session.exec(
+                    update(BroadcastRecipientModel)
+                    .where(col(BroadcastRecipientModel.broadcast_id) == broadcast_id)
+                    .where(col(BroadcastRecipientModel.user_id).in_(user_ids))
+                    .values(status=status)
+                )
+            session.commit()
+
+    @classmethod
+    def count_recipients(cls, broadcast_id: int) -> dict[RecipientStatus, int]:
+        with Session(cls._engine) as session:
+            statement = (
+                select(BroadcastRecipientModel.status, func.count())
+                .where(BroadcastRecipientModel.broadcast_id == broadcast_id)
+                .group_by(col(BroadcastRecipientModel.status))
+            )
+            counts = dict.fromkeys(RecipientStatus, 0)
+            for status, count in session.exec(statement).all():
+                counts[RecipientStatus(status)] = count
+
+            return counts
@@ -1,19 +1,60 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import TypeVar
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import TYPE_CHECKING, Any, ClassVar, ParamSpec, TypeVar
 
-from sqlmodel import Session, SQLModel, create_engine
+from sqlalchemy import Engine, event
+from sqlmodel import Session, SQLModel, create_engine, update
 
 from src import config
 
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from sqlalchemy import ColumnElement
+
 ModelT = TypeVar("ModelT", bound=SQLModel)
+ResultT = TypeVar("ResultT")
+P = ParamSpec("P")
+
+# WAL lets readers work while the single writer commits, synchronous=NORMAL syncs only at checkpoints in WAL-mode
+PRAGMAS = (
+    "journal_mode=WAL",
+    "synchronous=NORMAL",
+    "busy_timeout=5000",
+    "cache_size=-16000",
+    "temp_store=MEMORY",
+)
 
 logger = logging.getLogger(__name__)
 
 
+def create_db_engine(url: str) -> Engine:
+    engine = create_engine(url)
+    event.listen(engine, "connect", _set_pragmas)
+
+    return engine
+
+
+def _set_pragmas(dbapi_connection: Any, _: object) -> None:  # noqa: ANN401
+    cursor = dbapi_connection.cursor()
+    for pragma in PRAGMAS:
+        cursor.execute(f"PRAGMA {pragma}")
+    cursor.close()
+
+
 class DbClient:
-    _engine = create_engine(f"sqlite:///{config.DATABASE}")
+    """Base of the database clients."""
+
+    _engine = create_db_engine(f"sqlite:///{config.DATABASE}")
+    _executor: ClassVar[ThreadPoolExecutor] = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db")
+
+    @classmethod
+    async def run(cls, function: Callable[P, ResultT], *args: P.args, **kwargs: P.kwargs) -> ResultT:
+        return await asyncio.get_running_loop().run_in_executor(cls._executor, partial(function, *args, **kwargs))
 
     @classmethod
     def init_db(cls) -> None:
@@ -28,6 +69,7 @@ class DbClient:
             session.commit()
             session.refresh(model)
             session.expunge(model)
+            cls._on_change(model)
 
             return model
 
@@ -36,10 +78,34 @@ class DbClient:
         session.add(model)
         session.commit()
         session.refresh(model)
+        cls._on_change(model)
 
         return model
 
     @classmethod
-    def _delete(cls, session: Session, instance: object) -> None:
+    def _update_where(cls, model: type[ModelT], where: ColumnElement[bool], **values: Any) -> list[ModelT]:  # noqa: ANN401
+        # A single UPDATE ... RETURNING, instead of fetching, updating and refreshing the models
+        with Session(cls._engine, expire_on_commit=False) as session:
+            updated: list[ModelT] = list(
+                session.exec(update(model).where(where).values(**values).returning(model)).scalars()
+            )
+            session.commit()
+
+        for updated_model in updated:
+            cls._on_change(updated_model)
+
+        return updated
+
+    @classmethod
+    def _delete(cls, session: Session, instance: SQLModel) -> None:
         session.delete(instance)
         session.commit()
+        cls._on_delete(instance)
+
+    @classmethod
+    def _on_change(cls, model: SQLModel) -> None:
+        """React to an added or updated model."""
+
+    @classmethod
+    def _on_delete(cls, instance: SQLModel) -> None:
+        """React to a deleted model."""
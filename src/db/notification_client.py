@@ -1,13 +1,26 @@
 from __future__ import annotations
 
-from sqlmodel import Session, select
+from typing import Any
+
+from sqlalchemy import not_
+from sqlmodel import Session, SQLModel, col, select
 
 from src.db.db_client import DbClient
+from src.db.subscription_registry import SubscriptionRegistry
 from src.exceptions import NotificationNotFoundError
 from src.models import NotificationModel, UserModel
+from src.queries import QueriesCache
 
 
 class NotificationClient(DbClient):
+    @classmethod
+    def _on_change(cls, model: SQLModel) -> None:
+        SubscriptionRegistry.put(model)
+
+    @classmethod
+    def _on_delete(cls, instance: SQLModel) -> None:
+        SubscriptionRegistry.remove(instance)
+
     @classmethod
     def fetch(cls, notification_id: int) -> NotificationModel:
         with Session(cls._engine) as session:
@@ -52,49 +65,39 @@ class NotificationClient(DbClient):
         with Session(cls._engine) as session:
             notification = cls._fetch(session, notification_id)
             cls._delete(session, notification)
+            QueriesCache.invalidate(notification_id)
 
             return notification
 
+    @classmethod
+    def _update_by_id(cls, notification_id: int, **values: Any) -> NotificationModel:  # noqa: ANN401
+        updated = cls._update_where(NotificationModel, col(NotificationModel.id) == notification_id, **values)
+        if not updated:
+            raise NotificationNotFoundError(notification_id)
+
+        return updated[0]
+
     @classmethod
     def update_query(cls, notification_id: int, new_query: str) -> NotificationModel:
-        with Session(cls._engine) as session:
-            notification = cls._fetch(session, notification_id)
-            notification.search_query = new_query
-            return cls._update(session, notification)
+        QueriesCache.invalidate(notification_id)
+        return cls._update_by_id(notification_id, search_query=new_query)
 
     @classmethod
     def update_min_price(cls, notification_id: int, new_min_price: int) -> NotificationModel:
-        with Session(cls._engine) as session:
-            notification = cls._fetch(session, notification_id)
-            notification.min_price = new_min_price
-            return cls._update(session, notification)
+        return cls._update_by_id(notification_id, min_price=new_min_price)
 
     @classmethod
     def update_max_price(cls, notification_id: int, new_max_price: int) -> NotificationModel:
-        with Session(cls._engine) as session:
-            notification = cls._fetch(session, notification_id)
-            notification.max_price = new_max_price
-            return cls._update(session, notification)
+        return cls._update_by_id(notification_id, max_price=new_max_price)
 
     @classmethod
     def toggle_search_hot_only(cls, notification_id: int) -> NotificationModel:
-        with Session(cls._engine) as session:
-            notification = cls._fetch(session, notification_id)
-            notification.search_hot_only = not notification.search_hot_only
-            return cls._update(session, notification)
+        return cls._update_by_id(notification_id, search_hot_only=not_(col(NotificationModel.search_hot_only)))
 
     @classmethod
     def toggle_search_description(cls, notification_id: int) -> NotificationModel:
-        with Session(cls._engine) as session:
-            notification = cls._fetch(session, notification_id)
-            notification.search_description = not notification.search_description
-            return cls._update(session, notification)
+        return cls._update_by_id(notification_id, search_description=not_(col(NotificationModel.search_description)))
 
     @classmethod
     def update_user_id(cls, old_user_id: int, new_user_id: int) -> None:
-        notifications = cls.fetch_by_user_id(old_user_id)
-
-        with Session(cls._engine) as session:
-            for notification in notifications:
-                notification.user_id = new_user_id
-                cls._update(session, notification)
+        cls._update_where(NotificationModel, col(NotificationModel.user_id) == old_user_id, user_id=new_user_id)
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from sqlalchemy import literal
+from sqlalchemy.dialects.sqlite import insert
+from sqlmodel import Session, col, delete, or_, select, update
+
+from src.db.db_client import DbClient
+from src.models import OutboxModel
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+
+class OutboxClient(DbClient):
+    @classmethod
+    def add_all(cls, entries: Sequence[OutboxModel]) -> int:
+        with Session(cls._engine) as session:
+            added = cls._add_all(session, entries)
+            session.commit()
+
+            return added
+
+    @classmethod
+    def _add_all(cls, session: Session, entries: Sequence[OutboxModel]) -> int:
+        if not entries:
+            return 0
+
+        result = session.exec(
+            insert(OutboxModel)
+            .values([entry.model_dump(exclude={"id"}) for entry in entries])
+            .on_conflict_do_nothing(index_elements=["key"])
+        )
+
+        return result.rowcount
+
+    @classmethod
+    def fetch_pending(cls, limit: int, max_attempts: int, now: float) -> list[OutboxModel]:
+        with Session(cls._engine) as session:
+            statement = (
+                select(OutboxModel)
+                .where(col(OutboxModel.sent_at).is_(None))
+                .where(OutboxModel.attempts < max_attempts)
+                .where(OutboxModel.next_attempt_at <= now)
+                .order_by(col(OutboxModel.id))
+                .limit(limit)
+            )
+
+            return list(session.exec(statement).all())
+
+    @classmethod
+    def mark_sent(cls, entry_ids: Sequence[int], sent_at: float) -> None:
+        with Session(cls._engine) as session:
+            session.exec(update(OutboxModel).where(col(OutboxModel.id).in_(entry_ids)).values(sent_at=sent_at))
+            session.commit()
+
+    @classmethod
+    def mark_failed(cls, entry_ids: Sequence[int], now: float, retry_delay: float) -> None:
+        # The delay doubles with every attempt
+        backoff = literal(retry_delay) * literal(1).op("<<")(col(OutboxModel.attempts))
+        with Session(cls._engine) as session:
+            session.exec(
+                update(OutboxModel)
+                .where(col(OutboxModel.id).in_(entry_ids))
+                .values(attempts=col(OutboxModel.attempts) + 1, next_attempt_at=now + backoff)
+            )
+            session.commit()
+
+    @classmethod
+    def purge(cls, before: float, max_attempts: int) -> None:
+        # Sent entries and entries that ran out of attempts
+        with Session(cls._engine) as session:
+            session.exec(
+                delete(OutboxModel).where(
+                    or_(
+                        col(OutboxModel.sent_at) < before,
+                        (OutboxModel.attempts >= max_attempts) & (OutboxModel.created_at < before),
+                    )
+                )
+            )
+            session.commit()
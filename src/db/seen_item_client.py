@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from sqlalchemy.dialects.sqlite import insert
+from sqlmodel import Session, col, delete, select
+
+from src.db.db_client import DbClient
+from src.db.outbox_client import OutboxClient
+from src.models import OutboxModel, SeenItemModel
+
+if TYPE_CHECKING:
+    from collections.abc import Collection, Sequence
+
+
+class SeenItemClient(DbClient):
+    @classmethod
+    def fetch_by_feed(cls, feed: str) -> list[SeenItemModel]:
+        with Session(cls._engine) as session:
+            statement = select(SeenItemModel).where(SeenItemModel.feed == feed).order_by(col(SeenItemModel.seen_at))
+
+            return list(session.exec(statement).all())
+
+    @classmethod
+    def save(
+        cls,
+        feed: str,
+        added: Collection[SeenItemModel],
+        removed: Collection[str],
+        outbox: Sequence[OutboxModel] = (),
+    ) -> int:
+        # The outbox entries of the new items are written in the same transaction, so an item is never marked as seen
+        # without its deliveries
+        with Session(cls._engine) as session:
+            queued = OutboxClient._add_all(session, outbox)  # noqa: SLF001
+            if removed:
+                session.exec(
+                    delete(SeenItemModel)
+                    .where(col(SeenItemModel.feed) == feed)
+                    .where(col(SeenItemModel.guid).in_(removed))
+                )
+            if added:
+                session.exec(
+                    insert(SeenItemModel).values([item.model_dump() for item in added]).on_conflict_do_nothing()
+                )
+            session.commit()
+
+            return queued
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import logging
+from threading import RLock
+from typing import ClassVar
+
+from sqlmodel import Session, SQLModel, select
+
+from src.db.db_client import DbClient
+from src.models import NotificationModel, Subscription, UserModel
+
+logger = logging.getLogger(__name__)
+
+
+class SubscriptionRegistry(DbClient):
+    """Long-lived in-memory copy of all users and notifications."""
+
+    _lock = RLock()
+    _loaded: ClassVar[bool] = False
+    _version: ClassVar[int] = 0
+    _users: ClassVar[dict[int, UserModel]] = {}
+    _notifications: ClassVar[dict[int, NotificationModel]] = {}
+    _subscriptions: ClassVar[list[Subscription] | None] = None
+
+    @classmethod
+    def load(cls) -> None:
+        users, notifications = cls._fetch_state()
+
+        with cls._lock:
+            cls._users = users
+            cls._notifications = notifications
+            cls._loaded = True
+            cls._changed()
+
+        logger.info("Loaded %s users and %s notifications into the registry", len(users), len(notifications))
+
+    @classmethod
+    def _fetch_state(cls) -> tuple[dict[int, UserModel], dict[int, NotificationModel]]:
+        with Session(cls._engine) as session:
+            users = {user.id: user for user in session.exec(select(UserModel)).all()}
+            notifications = {n.id: n for n in session.exec(select(NotificationModel)).all()}
+
+        return users, notifications
+
+    @classmethod
+    def unload(cls) -> None:
+        with cls._lock:
+            cls._users = {}
+            cls._notifications = {}
+            cls._loaded = False
+            cls._changed()
+
+    @classmethod
+    def is_loaded(cls) -> bool:
+        return cls._loaded
+
+    @classmethod
+    def version(cls) -> int:
+        return cls._version
+
+    @classmethod
+    def subscriptions(cls) -> list[Subscription]:
+        return cls.snapshot()[1]
+
+    @classmethod
+    def snapshot(cls) -> tuple[int, list[Subscription]]:
+        if not cls._loaded:
+            cls.load()
+
+        with cls._lock:
+            if cls._subscriptions is None:
+                cls._subscriptions = [
+                    (notification, cls._users[notification.user_id])
+                    for _, notification in sorted(cls._notifications.items())
+                    if notification.user_id in cls._users and cls._users[notification.user_id].active
+                ]
+
+            return cls._version, cls._subscriptions
+
+    @classmethod
+    def subscription(cls, notification_id: int) -> Subscription | None:
+        if not cls._loaded:
+            cls.load()
+
+        with cls._lock:
+            notification = cls._notifications.get(notification_id)
+            user = cls._users.get(notification.user_id) if notification else None
+
+            if notification is None or user is None or not user.active:
+                return None
+
+            return notification, user
+
+    @classmethod
+    def check_consistency(cls) -> bool:
+        if not cls._loaded:
+            return True
+
+        users, notifications = cls._fetch_state()
+
+        with cls._lock:
+            consistent = cls._dump(users) == cls._dump(cls._users) and cls._dump(notifications) == cls._dump(
+                cls._notifications
+            )
+
+        if not consistent:
+            logger.warning("Subscription registry is out of sync with the database. Reload.")
+            cls.load()
+
+        return consistent
+
+    @staticmethod
+    def _dump(models: dict[int, UserModel] | dict[int, NotificationModel]) -> dict[int, dict[str, object]]:
+        return {model_id: model.model_dump() for model_id, model in models.items()}
+
+    @classmethod
+    def put(cls, model: SQLModel) -> None:
+        if isinstance(model, UserModel):
+            cls.put_user(model)
+        elif isinstance(model, NotificationModel):
+            cls.put_notification(model)
+
+    @classmethod
+    def remove(cls, model: SQLModel) -> None:
+        if isinstance(model, UserModel):
+            cls.remove_user(model.id)
+        elif isinstance(model, NotificationModel):
+            cls.remove_notification(model.id)
+
+    @classmethod
+    def put_user(cls, user: UserModel) -> None:
+        with cls._lock:
+            if cls._loaded:
+                cls._users[user.id] = user
+                cls._changed()
+
+    @classmethod
+    def remove_user(cls, user_id: int) -> None:
+        with cls._lock:
+            if cls._loaded and cls._users.pop(user_id, None) is not None:
+                cls._changed()
+
+    @classmethod
+    def put_notification(cls, notification: NotificationModel) -> None:
+        with cls._lock:
+            if cls._loaded:
+                cls._notifications[notification.id] = notification
+                cls._changed()
+
+    @classmethod
+    def remove_notification(cls, notification_id: int) -> None:
+        with cls._lock:
+            if cls._loaded and cls._notifications.pop(notification_id, None) is not None:
+                cls._changed()
+
+    @classmethod
+    def _changed(cls) -> None:
+        cls._subscriptions = None
+        cls._version += 1
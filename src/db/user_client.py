@@ -1,40 +1,52 @@
 from __future__ import annotations
 
-from sqlmodel import Session, select
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import not_
+from sqlmodel import Session, SQLModel, col, select
 
 from src.db.db_client import DbClient
+from src.db.subscription_registry import SubscriptionRegistry
 from src.exceptions import UserNotFoundError
 from src.models import UserModel
 
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
 
 class UserClient(DbClient):
     @classmethod
-    def fetch(cls, user_id: int) -> UserModel:
-        with Session(cls._engine) as session:
-            return cls._fetch(session, user_id)
+    def _on_change(cls, model: SQLModel) -> None:
+        SubscriptionRegistry.put(model)
 
     @classmethod
-    def fetch_all_ids(cls) -> list[int]:
-        with Session(cls._engine) as session:
-            statement = select(UserModel)
+    def _on_delete(cls, instance: SQLModel) -> None:
+        SubscriptionRegistry.remove(instance)
 
-            return [user.id for user in session.exec(statement).all()]
+    @classmethod
+    def fetch(cls, user_id: int) -> UserModel:
+        with Session(cls._engine) as session:
+            return cls._fetch(session, user_id)
 
     @classmethod
     def disable(cls, user_id: int) -> UserModel:
-        with Session(cls._engine) as session:
-            user = cls._fetch(session, user_id)
-            user.active = False
+        return cls._update_by_id(user_id, active=False)
 
-            return cls._update(session, user)
+    @classmethod
+    def disable_all(cls, user_ids: Sequence[int]) -> None:
+        cls._update_where(UserModel, col(UserModel.id).in_(user_ids), active=False)
 
     @classmethod
     def enable(cls, user_id: int) -> UserModel:
-        with Session(cls._engine) as session:
-            user = cls._fetch(session, user_id)
-            user.active = True
+        return cls._update_by_id(user_id, active=True)
+
+    @classmethod
+    def _update_by_id(cls, user_id: int, **values: Any) -> UserModel:  # noqa: ANN401
+        updated = cls._update_where(UserModel, col(UserModel.id) == user_id, **values)
+        if not updated:
+            raise UserNotFoundError(user_id)
 
-            return cls._update(session, user)
+        return updated[0]
 
     @classmethod
     def _fetch(cls, session: Session, user_id: int) -> UserModel:
@@ -54,31 +66,19 @@ class UserClient(DbClient):
 
     @classmethod
     def toggle_search_mydealz(cls, user_id: int) -> UserModel:
-        with Session(cls._engine) as session:
-            user = cls._fetch(session, user_id)
-            user.search_mydealz = not user.search_mydealz
-
-            return cls._update(session, user)
+        return cls._update_by_id(user_id, search_mydealz=not_(col(UserModel.search_mydealz)))
 
     @classmethod
     def toggle_search_preisjaeger(cls, user_id: int) -> UserModel:
-        with Session(cls._engine) as session:
-            user = cls._fetch(session, user_id)
-            user.search_preisjaeger = not user.search_preisjaeger
-
-            return cls._update(session, user)
+        return cls._update_by_id(user_id, search_preisjaeger=not_(col(UserModel.search_preisjaeger)))
 
     @classmethod
     def toggle_send_images(cls, user_id: int) -> UserModel:
-        with Session(cls._engine) as session:
-            user = cls._fetch(session, user_id)
-            user.send_images = not user.send_images
-
-            return cls._update(session, user)
+        return cls._update_by_id(user_id, send_images=not_(col(UserModel.send_images)))
 
     @classmethod
     def update_user_id(cls, user: UserModel, new_id: int) -> UserModel:
-        with Session(cls._engine) as session:
-            user.id = new_id
+        updated = cls._update_by_id(user.id, id=new_id)
+        SubscriptionRegistry.remove_user(user.id)
 
-            return cls._update(session, user)
+        return updated
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from collections import deque
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+class AhoCorasick:
+    """Multi-pattern substring search over a fixed set of keywords."""
+
+    def __init__(self, keywords: Iterable[str]):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._output: list[list[str]] = [[]]
+
+        for keyword in keywords:
+            if keyword:
+                self._add(keyword)
+
+        self._build()
+
+    def _add(self, keyword: str) -> None:
+        node = 0
+        for char in keyword:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[node][char] = next_node
+            node = next_node
+
+        if keyword not in self._output[node]:
+            self._output[node].append(keyword)
+
+    def _build(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+
+                self._fail[child] = self._goto[fail].get(char, 0)
+                self._output[child] += self._output[self._fail[child]]
+
+    def search(self, text: str) -> dict[str, int]:
+        goto, fail, output = self._goto, self._fail, self._output
+        found: dict[str, int] = {}
+
+        node = 0
+        for index, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+
+            for keyword in output[node]:
+                if keyword not in found:
+                    found[keyword] = index + 1
+
+        return found
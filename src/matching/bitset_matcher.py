@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from src.matching.aho_corasick import AhoCorasick
+from src.matching.matcher import Matcher
+from src.matching.subscription_index import find_deal_terms
+from src.queries import AndQuery
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Sequence
+
+    from src.models import DealModel, NotificationModel, Subscription
+
+ALWAYS_PRESENT = 0
+NEVER_PRESENT = 1
+
+
+class BitsetMatcher(Matcher):
+    """Vectorized matcher computing all matches of a cycle with a few NumPy operations."""
+
+    def __init__(
+        self,
+        subscriptions: Sequence[Subscription],
+        match_function: Callable[[NotificationModel, DealModel], bool],
+    ):
+        super().__init__(subscriptions, match_function)
+        self._term_ids: dict[str, int] = {"": ALWAYS_PRESENT}
+        self._scalar_groups: list[int] = []
+        vector_groups: list[int] = []
+        group_starts: list[int] = []
+        positive_terms: list[int] = []
+        positive_starts: list[int] = []
+        required: list[int] = []
+        negative_terms: list[int] = []
+        negative_starts: list[int] = []
+        search_description: list[bool] = []
+
+        for position, group in enumerate(self._groups):
+            queries = group.notification.queries.queries
+            if not all(isinstance(query, AndQuery) for query in queries):
+                self._scalar_groups.append(position)
+                continue
+
+            vector_groups.append(position)
+            group_starts.append(len(required))
+            for query in queries:
+                if not isinstance(query, AndQuery):
+                    continue
+
+                positive = {self._term_id(term) for term in query.contains} | {ALWAYS_PRESENT}
+                positive_starts.append(len(positive_terms))
+                positive_terms.extend(positive)
+                required.append(len(positive))
+
+                negative = {self._term_id(term) for term in query.contains_not} | {NEVER_PRESENT}
+                negative_starts.append(len(negative_terms))
+                negative_terms.extend(negative)
+
+                search_description.append(group.notification.search_description)
+
+        self._automaton = AhoCorasick(self._term_ids)
+        self._vector_groups = np.array(vector_groups, dtype=np.intp)
+        self._group_starts = np.array(group_starts, dtype=np.intp)
+        self._positive_terms = np.array(positive_terms, dtype=np.intp)
+        self._positive_starts = np.array(positive_starts, dtype=np.intp)
+        self._required = np.array(required, dtype=np.int32)
+        self._negative_terms = np.array(negative_terms, dtype=np.intp)
+        self._negative_starts = np.array(negative_starts, dtype=np.intp)
+        self._search_description = np.array(search_description, dtype=bool)
+        self._min_prices = np.array([self._groups[p].notification.min_price or 0 for p in vector_groups], dtype=float)
+        self._max_prices = np.array([self._groups[p].notification.max_price or 0 for p in vector_groups], dtype=float)
+
+    def _term_id(self, term: str) -> int:
+        if term not in self._term_ids:
+            self._term_ids[term] = len(self._term_ids) + 1  # column 1 is reserved for NEVER_PRESENT
+
+        return self._term_ids[term]
+
+    def _presence_matrices(self, deals: Sequence[DealModel]) -> tuple[np.ndarray, np.ndarray]:
+        title_presence = np.zeros((len(deals), len(self._term_ids) + 1), dtype=bool)
+        text_presence = np.zeros_like(title_presence)
+        title_presence[:, ALWAYS_PRESENT] = True
+        text_presence[:, ALWAYS_PRESENT] = True
+
+        for row, deal in enumerate(deals):
+            title_hits, hits = find_deal_terms(self._automaton, deal)
+            title_presence[row, self._column_ids(title_hits)] = True
+            text_presence[row, self._column_ids(hits)] = True
+
+        return title_presence, text_presence
+
+    def _column_ids(self, terms: Iterable[str]) -> list[int]:
+        return [self._term_ids[term] for term in terms]
+
+    def _vector_matches(self, deals: Sequence[DealModel]) -> np.ndarray:
+        title_presence, text_presence = self._presence_matrices(deals)
+
+        positive = np.where(
+            self._search_description,
+            np.add.reduceat(text_presence[:, self._positive_terms], self._positive_starts, axis=1, dtype=np.int32),
+            np.add.reduceat(title_presence[:, self._positive_terms], self._positive_starts, axis=1, dtype=np.int32),
+        )
+        negative = np.where(
+            self._search_description,
+            np.logical_or.reduceat(text_presence[:, self._negative_terms], self._negative_starts, axis=1),
+            np.logical_or.reduceat(title_presence[:, self._negative_terms], self._negative_starts, axis=1),
+        )
+        text_matches = np.logical_or.reduceat((positive == self._required) & ~negative, self._group_starts, axis=1)
+
+        amounts = np.array([deal.price.amount for deal in deals], dtype=float)[:, np.newaxis]
+        min_price_matches = (self._min_prices == 0) | ((amounts != 0) & (amounts >= self._min_prices))
+        max_price_matches = (amounts == 0) | (self._max_prices == 0) | (amounts <= self._max_prices)
+
+        return np.asarray(text_matches & min_price_matches & max_price_matches)
+
+    def _matching_groups(self, deals: Sequence[DealModel]) -> list[list[int]]:
+        if not deals:
+            return []
+
+        self.stats.candidates += len(deals) * self._subscription_count
+        self.stats.evaluations += len(deals) * len(self._groups)
+
+        vector_matches = self._vector_matches(deals) if len(self._vector_groups) else None
+
+        matching_groups = []
+        for row, deal in enumerate(deals):
+            positions = [
+                position
+                for position in self._scalar_groups
+                if self._match_function(self._groups[position].notification, deal)
+            ]
+            if vector_matches is not None:
+                positions.extend(self._vector_groups[np.flatnonzero(vector_matches[row])].tolist())
+
+            matching_groups.append(sorted(positions))
+
+        return matching_groups
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import heapq
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from operator import itemgetter
+from typing import TYPE_CHECKING
+
+from src import config
+from src.matching.price_index import PriceIndex
+from src.matching.subscription_index import SubscriptionIndex
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+    from src.models import DealModel, NotificationModel, Subscription
+
+QueryGroupKey = tuple[str, bool, int | None, int | None, bool]
+
+
+@dataclass
+class MatchStats:
+    deals: int = 0
+    subscriptions: int = 0
+    candidates: int = 0
+    evaluations: int = 0
+
+    @property
+    def saved_evaluations(self) -> int:
+        return self.subscriptions - self.evaluations
+
+    def __str__(self) -> str:
+        return (
+            f"{self.deals} deals, {self.evaluations} query evaluations instead of {self.subscriptions} "
+            f"({self.candidates} candidates, {self.saved_evaluations} saved)"
+        )
+
+
+@dataclass
+class QueryGroup:
+    notification: NotificationModel
+    members: list[tuple[int, Subscription]] = field(default_factory=list)
+
+
+class Matcher(ABC):
+    """Matches deals against all subscriptions, evaluating every distinct query only once per deal."""
+
+    def __init__(
+        self,
+        subscriptions: Sequence[Subscription],
+        match_function: Callable[[NotificationModel, DealModel], bool],
+    ):
+        self._match_function = match_function
+        self._subscription_count = len(subscriptions)
+        self.stats = MatchStats()
+
+        groups: dict[QueryGroupKey, QueryGroup] = {}
+        for position, (notification, user) in enumerate(subscriptions):
+            key = self.group_key(notification)
+            if key not in groups:
+                groups[key] = QueryGroup(notification)
+            groups[key].members.append((position, (notification, user)))
+
+        self._groups = list(groups.values())
+
+    @staticmethod
+    def group_key(notification: NotificationModel) -> QueryGroupKey:
+        return (
+            notification.search_query,
+            notification.search_description,
+            notification.min_price,
+            notification.max_price,
+            notification.search_hot_only,
+        )
+
+    @property
+    def group_count(self) -> int:
+        return len(self._groups)
+
+    @abstractmethod
+    def _matching_groups(self, deals: Sequence[DealModel]) -> list[list[int]]:
+        """Evaluate the query groups for the given deals.
+
+        :param deals: The deals to match
+        :return: The positions of the matching groups, per deal
+        """
+        raise NotImplementedError
+
+    def match_deals(self, deals: Sequence[DealModel]) -> list[list[Subscription]]:
+        self.stats.deals += len(deals)
+        self.stats.subscriptions += len(deals) * self._subscription_count
+
+        return [
+            [
+                subscription
+                for _, subscription in heapq.merge(
+                    *[self._groups[position].members for position in positions], key=itemgetter(0)
+                )
+            ]
+            for positions in self._matching_groups(deals)
+        ]
+
+    def matches(self, deal: DealModel) -> list[Subscription]:
+        return self.match_deals([deal])[0]
+
+
+class IndexMatcher(Matcher):
+    """Matcher evaluating only the groups whose indexed terms are found in the deal and whose prices fit."""
+
+    def __init__(
+        self,
+        subscriptions: Sequence[Subscription],
+        match_function: Callable[[NotificationModel, DealModel], bool],
+    ):
+        super().__init__(subscriptions, match_function)
+        self._index = SubscriptionIndex([group.notification for group in self._groups])
+        self._price_index = PriceIndex([group.notification for group in self._groups])
+
+    def _matching_groups(self, deals: Sequence[DealModel]) -> list[list[int]]:
+        matching_groups = []
+        for deal in deals:
+            candidates = self._price_index.filter(self._index.candidates(deal), deal.price.amount)
+
+            self.stats.candidates += sum(len(self._groups[position].members) for position in candidates)
+            self.stats.evaluations += len(candidates)
+
+            matching_groups.append(
+                [position for position in candidates if self._match_function(self._groups[position].notification, deal)]
+            )
+
+        return matching_groups
+
+
+def create_matcher(
+    subscriptions: Sequence[Subscription],
+    match_function: Callable[[NotificationModel, DealModel], bool],
+) -> Matcher:
+    if config.MATCHING_ENGINE == "index":
+        return IndexMatcher(subscriptions, match_function)
+
+    if config.MATCHING_ENGINE == "bitset":
+        from src.matching.bitset_matcher import BitsetMatcher  # noqa: PLC0415
+
+        return BitsetMatcher(subscriptions, match_function)
+
+    msg = f"Unknown matching engine: {config.MATCHING_ENGINE}"
+    raise NotImplementedError(msg)
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
+    from src.models import NotificationModel
+
+NO_BOUND = -1
+
+
+class PriceIndex:
+    """Sorted min- and max-price bounds of notifications to filter candidates by a deal's price."""
+
+    def __init__(self, notifications: Sequence[NotificationModel]):
+        min_bounds = sorted((n.min_price, p) for p, n in enumerate(notifications) if n.min_price)
+        max_bounds = sorted((n.max_price, p) for p, n in enumerate(notifications) if n.max_price)
+
+        self._min_prices = [price for price, _ in min_bounds]
+        self._max_prices = [price for price, _ in max_bounds]
+        self._min_ranks = [NO_BOUND] * len(notifications)
+        self._max_ranks = [NO_BOUND] * len(notifications)
+
+        for rank, (_, position) in enumerate(min_bounds):
+            self._min_ranks[position] = rank
+        for rank, (_, position) in enumerate(max_bounds):
+            self._max_ranks[position] = rank
+
+    def filter(self, positions: Iterable[int], amount: float) -> list[int]:
+        min_ranks, max_ranks = self._min_ranks, self._max_ranks
+
+        if not amount:
+            return [position for position in positions if min_ranks[position] == NO_BOUND]
+
+        min_limit = bisect_right(self._min_prices, amount)  # bounds below are <= amount
+        max_limit = bisect_left(self._max_prices, amount)  # bounds from here on are >= amount
+
+        return [
+            position
+            for position in positions
+            if min_ranks[position] < min_limit and (max_ranks[position] == NO_BOUND or max_ranks[position] >= max_limit)
+        ]
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import TYPE_CHECKING
+
+from src.matching.aho_corasick import AhoCorasick
+from src.queries import AndQuery
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from src.models import DealModel, NotificationModel
+    from src.queries import Queries
+
+
+class SubscriptionIndex:
+    """Inverted index from positive query terms to the notifications requiring them."""
+
+    def __init__(self, notifications: Sequence[NotificationModel]):
+        self._always: list[int] = []
+        self._title_terms: dict[str, list[int]] = defaultdict(list)
+        self._description_terms: dict[str, list[int]] = defaultdict(list)
+
+        for position, notification in enumerate(notifications):
+            anchors = self._anchors(notification.queries)
+            if anchors is None:
+                self._always.append(position)
+                continue
+
+            terms = self._description_terms if notification.search_description else self._title_terms
+            for anchor in anchors:
+                terms[anchor].append(position)
+
+        self._automaton = AhoCorasick({*self._title_terms, *self._description_terms})
+
+    @staticmethod
+    def _anchors(queries: Queries) -> set[str] | None:
+        anchors = set()
+        for query in queries.queries:
+            if not isinstance(query, AndQuery):
+                return None
+
+            terms = [term for term in query.contains if term]
+            if not terms:
+                return None
+
+            anchors.add(max(terms, key=len))
+
+        return anchors
+
+    def candidates(self, deal: DealModel) -> list[int]:
+        title_hits, hits = find_deal_terms(self._automaton, deal)
+
+        positions = set(self._always)
+        for term in title_hits:
+            positions.update(self._title_terms.get(term, ()))
+        for term in hits:
+            positions.update(self._description_terms.get(term, ()))
+
+        return sorted(positions)
+
+
+def find_deal_terms(automaton: AhoCorasick, deal: DealModel) -> tuple[list[str], list[str]]:
+    # Scan the deal once and return the terms found in the search-title and in the search-title and description
+    title = deal.search_title.lower()
+    text = deal.search_title_and_description.lower()
+
+    hits = automaton.search(text)
+    if text.startswith(title):
+        return [term for term, end in hits.items() if end <= len(title)], list(hits)
+
+    return list(automaton.search(title)), list(hits)
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
 import datetime  # noqa: TC003
+from enum import StrEnum
 
 from pydantic import BaseModel
 from sqlmodel import Field, SQLModel
 
-from src.queries import Queries
+from src.queries import Queries, QueriesCache
 
 
 class UserModel(SQLModel, table=True):
@@ -37,7 +38,55 @@ class NotificationModel(SQLModel, table=True):
 
     @property
     def queries(self) -> Queries:
-        return Queries(self.search_query)
+        return QueriesCache.get(self.id, self.search_query)
+
+
+class SeenItemModel(SQLModel, table=True):
+    __tablename__ = "seen_items"
+
+    feed: str = Field(primary_key=True)
+    guid: str = Field(primary_key=True)
+    published: float
+    seen_at: float
+
+
+class OutboxModel(SQLModel, table=True):
+    __tablename__ = "outbox"
+
+    id: int = Field(default=None, primary_key=True)
+    key: str = Field(unique=True)
+    notification_id: int
+    user_id: int
+    deal: str
+    created_at: float
+    sent_at: float | None = Field(default=None, index=True)
+    attempts: int = 0
+    next_attempt_at: float = 0
+
+
+class BroadcastModel(SQLModel, table=True):
+    __tablename__ = "broadcasts"
+
+    id: int = Field(default=None, primary_key=True)
+    message_id: int
+    progress_message_id: int | None = None
+    created_at: float
+    finished_at: float | None = Field(default=None, index=True)
+
+
+class RecipientStatus(StrEnum):
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+    BLOCKED = "blocked"
+
+
+class BroadcastRecipientModel(SQLModel, table=True):
+    __tablename__ = "broadcast_recipients"
+
+    broadcast_id: int = Field(foreign_key="broadcasts.id", primary_key=True, ondelete="CASCADE")
+    user_id: int = Field(primary_key=True)
+    status: RecipientStatus = Field(default=RecipientStatus.PENDING, index=True)
 
 
 class PriceModel(BaseModel):
@@ -54,6 +103,11 @@ class DealModel(BaseModel):
     link: str
     image_url: str
     published: datetime.datetime
+    guid: str = ""
+
+    @property
+    def key(self) -> str:
+        return self.guid or self.link
 
     @property
     def full_title(self) -> str:
@@ -73,3 +127,6 @@ class DealModel(BaseModel):
     @property
     def search_title_and_description(self) -> str:
         return self.search_title + " ".join(self.description.split())
+
+
+Subscription = tuple[NotificationModel, UserModel]
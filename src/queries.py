@@ -2,6 +2,11 @@ from __future__ import annotations
 
 import re
 from abc import abstractmethod
+from collections import OrderedDict
+from threading import RLock
+from typing import ClassVar
+
+from src import config
 
 
 class Queries:
@@ -16,10 +21,55 @@ class Queries:
         for query_part in query.split(","):
             self._queries.add(AndQuery(query_part))
 
+    @property
+    def queries(self) -> set[Query]:
+        return self._queries
+
     def any_match(self, text: str) -> bool:
         return any(query.matches(text) for query in self._queries)
 
 
+class QueriesCache:
+    """LRU cache of compiled Queries, keyed by notification id and query text."""
+
+    # Matching reads the cache on the event loop, notification changes invalidate it in the database thread
+    _lock = RLock()
+    _cache: ClassVar[OrderedDict[int, tuple[str, Queries]]] = OrderedDict()
+    _max_size: int = config.QUERY_CACHE_SIZE
+
+    @classmethod
+    def get(cls, notification_id: int | None, query: str) -> Queries:
+        if notification_id is None:
+            return Queries(query)
+
+        with cls._lock:
+            cached = cls._cache.get(notification_id)
+            if cached and cached[0] == query:
+                cls._cache.move_to_end(notification_id)
+
+                return cached[1]
+
+        queries = Queries(query)
+        with cls._lock:
+            cls._cache[notification_id] = (query, queries)
+            cls._cache.move_to_end(notification_id)
+
+            while len(cls._cache) > cls._max_size:
+                cls._cache.popitem(last=False)
+
+        return queries
+
+    @classmethod
+    def invalidate(cls, notification_id: int) -> None:
+        with cls._lock:
+            cls._cache.pop(notification_id, None)
+
+    @classmethod
+    def clear(cls) -> None:
+        with cls._lock:
+            cls._cache.clear()
+
+
 class Query:
     @abstractmethod
     def matches(self, text: str) -> bool:
@@ -44,6 +94,14 @@ class AndQuery(Query):
             else:
                 self._contains.add(stripped_query)
 
+    @property
+    def contains(self) -> set[str]:
+        return self._contains
+
+    @property
+    def contains_not(self) -> set[str]:
+        return self._contains_not
+
     def matches(self, text: str) -> bool:
         text = text.lower()
 
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import re
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, ClassVar
+from urllib.parse import urlsplit
+
+from src import config
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Mapping
+
+    from src.models import DealModel, NotificationModel
+
+THREAD_ID_PATTERN = re.compile(r"-(\d+)$")
+
+MatchKey = tuple[str, bool, int | None, int | None]
+
+
+@dataclass
+class CachedDeal:
+    deal: DealModel
+    matches: dict[MatchKey, bool] = field(default_factory=dict)
+
+
+class DealCache:
+    """LRU cache of parsed deals and their query results, shared by all feeds and keyed by the deal's thread."""
+
+    _cache: ClassVar[OrderedDict[str, CachedDeal]] = OrderedDict()
+    _max_size: int = config.DEAL_CACHE_SIZE
+    _reused_deals = 0
+    _reused_matches = 0
+    _evaluated_matches = 0
+
+    @classmethod
+    def deal_key(cls, link: str) -> str:
+        # Pepper links end with the thread id, the slug before it may change when a deal is edited
+        parts = urlsplit(link.strip())
+        path = parts.path.rstrip("/")
+        if thread_id := THREAD_ID_PATTERN.search(path):
+            return f"{parts.netloc.lower()}#{thread_id[1]}"
+
+        return f"{parts.netloc.lower()}{path}"
+
+    @classmethod
+    def snapshot(cls) -> dict[str, DealModel]:
+        return {key: cached.deal for key, cached in cls._cache.items()}
+
+    @classmethod
+    def resolve(cls, parsed: list[DealModel | str], cached: Mapping[str, DealModel]) -> list[DealModel]:
+        # The parsers return the keys of cached deals instead of decoding them again. They are looked up in the
+        # snapshot taken before parsing, as the deals may have been evicted in the meantime.
+        deals = []
+        for item in parsed:
+            if isinstance(item, str):
+                cls._reused_deals += 1
+                deals.append(cached[item])
+            else:
+                deals.append(item)
+
+        return deals
+
+    @classmethod
+    def put(cls, deal: DealModel) -> None:
+        key = cls.deal_key(deal.link)
+        if key in cls._cache:
+            cls._cache.move_to_end(key)
+
+            return
+
+        cls._cache[key] = CachedDeal(deal)
+        while len(cls._cache) > cls._max_size:
+            cls._cache.popitem(last=False)
+
+    @classmethod
+    def matches(
+        cls,
+        notification: NotificationModel,
+        deal: DealModel,
+        match_function: Callable[[NotificationModel, DealModel], bool],
+    ) -> bool:
+        cached = cls._cache.get(cls.deal_key(deal.link))
+        if cached is None:
+            return match_function(notification, deal)
+
+        key = (
+            notification.search_query,
+            notification.search_description,
+            notification.min_price,
+            notification.max_price,
+        )
+        if key in cached.matches:
+            cls._reused_matches += 1
+
+            return cached.matches[key]
+
+        cls._evaluated_matches += 1
+        cached.matches[key] = match_function(notification, deal)
+
+        return cached.matches[key]
+
+    @classmethod
+    def stats(cls) -> str:
+        return (
+            f"{len(cls._cache)} deals cached, {cls._reused_deals} reused, "
+            f"{cls._reused_matches}/{cls._reused_matches + cls._evaluated_matches} query results reused"
+        )
+
+    @classmethod
+    def clear(cls) -> None:
+        cls._cache.clear()
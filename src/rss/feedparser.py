@@ -2,81 +2,237 @@ from __future__ import annotations
 
 import asyncio
 import logging
-import os
-from asyncio import create_task
-from datetime import datetime, timedelta
-from threading import Event, Thread
-from typing import TYPE_CHECKING
+import time
+from asyncio import Queue, QueueShutDown, Task
+from contextlib import suppress
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, ClassVar
 
 from src import config
-from src.db.notification_client import NotificationClient
+from src.db.seen_item_client import SeenItemClient
+from src.db.subscription_registry import SubscriptionRegistry
+from src.matching.matcher import MatchStats, create_matcher
+from src.rss.deal_cache import DealCache
 from src.rss.feeds import AbstractFeed
+from src.rss.http_client import HttpClient
+from src.rss.parser_pool import ParserPool
+from src.rss.scheduler import FeedScheduler
+from src.telegram.outbox_sender import OutboxSender
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from src.matching.matcher import Matcher
     from src.models import DealModel, NotificationModel
     from src.telegram.bot import TelegramBot
 
 logger = logging.getLogger(__name__)
 
 
-class FeedParser(Thread):
+@dataclass
+class StageStats:
+    items: int = 0
+    seconds: float = 0.0
+    max_queue_depth: int = 0
+
+    def add(self, seconds: float) -> None:
+        self.items += 1
+        self.seconds += seconds
+
+    def queued(self, queue_depth: int) -> None:
+        self.max_queue_depth = max(self.max_queue_depth, queue_depth)
+
+    def __str__(self) -> str:
+        return f"{self.items} in {self.seconds * 1000:.0f} ms, max queue depth {self.max_queue_depth}"
+
+
+@dataclass
+class PipelineStats:
+    fetch: StageStats = field(default_factory=StageStats)
+    match: StageStats = field(default_factory=StageStats)
+    queued_deliveries: int = 0
+
+    def __str__(self) -> str:
+        return (
+            f"fetched feeds: {self.fetch} | matched feeds: {self.match} | queued deliveries: {self.queued_deliveries}"
+        )
+
+
+class FeedParser:
+    """Polls the feeds as a long-lived task on the bot's event loop."""
+
+    _matchers: ClassVar[dict[type[AbstractFeed], Matcher]] = {}
+    _matchers_version: int | None = None
+
     def __init__(self, bot: TelegramBot):
-        super().__init__()
         self.bot = bot
-        self.exit_event = Event()
+        self.exit_event = asyncio.Event()
+        self.scheduler = FeedScheduler(AbstractFeed.__subclasses__())
+        self.outbox_sender = OutboxSender(bot)
+        self._task: Task[None] | None = None
+
+    async def start(self) -> None:
+        self.exit_event.clear()
+        self._task = asyncio.create_task(self.run(), name="feedparser")
+        self._task.add_done_callback(self._on_done)
+        self.outbox_sender.start()
+
+    async def exit(self) -> None:
+        self.exit_event.set()
+        if self._task is not None:
+            # A crashed task was already logged by _on_done, the outbox sender is stopped anyway
+            with suppress(Exception):
+                await self._task
+            self._task = None
 
-    def run(self) -> None:
+        await self.outbox_sender.exit()
+
+    @classmethod
+    def _on_done(cls, task: Task[None]) -> None:
+        if not task.cancelled() and (exception := task.exception()):
+            logger.error("Feedparser stopped unexpectedly", exc_info=exception)
+
+    async def run(self) -> None:
+        last_consistency_check = time.monotonic()
         try:
+            try:
+                await asyncio.to_thread(ParserPool.start)
+            except Exception:
+                logger.exception("Starting the feed parser processes failed. Parse in-process")
+
             while not self.exit_event.is_set():
+                feeds = self.scheduler.due_feeds()
+                new_deals: dict[type[AbstractFeed], int] = {}
                 try:
-                    asyncio.run(FeedParser(self.bot).parse_feeds())
+                    new_deals = await self.parse_feeds(feeds)
                 except Exception:
                     logger.exception("Error while parsing / sending deals")
 
-                logger.info(
-                    "Next feedparser-run: %s",
-                    datetime.now(tz=config.TIMEZONE) + timedelta(seconds=config.PARSE_INTERVAL),
-                )
-                self.exit_event.wait(config.PARSE_INTERVAL)
-
-        except (KeyboardInterrupt, SystemExit):
-            pass
+                for feed in feeds:
+                    self.scheduler.record_poll(feed, new_deals.get(feed, 0))
 
-        os._exit(0 if self.exit_event.is_set() else 1)  # Kill main thread (telegram-bot)
+                if time.monotonic() - last_consistency_check >= config.REGISTRY_CHECK_INTERVAL:
+                    try:
+                        await SubscriptionRegistry.run(SubscriptionRegistry.check_consistency)
+                    except Exception:
+                        logger.exception("Error while checking the subscription registry")
+                    last_consistency_check = time.monotonic()
 
-    def exit(self) -> None:
-        self.exit_event.set()
+                logger.info("Feed schedule: %s", self.scheduler)
+                with suppress(TimeoutError):
+                    await asyncio.wait_for(self.exit_event.wait(), self.scheduler.seconds_until_next_poll())
+        finally:
+            await HttpClient.close()
+            await asyncio.to_thread(ParserPool.shutdown)
 
-    async def parse_feeds(self) -> None:
-        feeds: list[type[AbstractFeed]] = AbstractFeed.__subclasses__()
+    async def parse_feeds(self, feeds: Sequence[type[AbstractFeed]] | None = None) -> dict[type[AbstractFeed], int]:
+        # Fetch/parse -> match pipeline. Every feed is matched as soon as it is parsed and its deliveries are written to
+        # the outbox, which the outbox-sender drains independently. The bounded queue lets matching hold back parsing.
+        if feeds is None:
+            feeds = AbstractFeed.__subclasses__()
 
-        deals_list = await asyncio.gather(
-            *[create_task(feed.get_new_deals()) for feed in feeds],
-            return_exceptions=False,
-        )
+        stats = PipelineStats()
+        new_deals: dict[type[AbstractFeed], int] = {}
+        parsed: Queue[tuple[type[AbstractFeed], list[DealModel]]] = Queue(config.PIPELINE_QUEUE_SIZE)
 
-        new_deals_amount = sum(len(deals) for deals in deals_list)
+        async with asyncio.TaskGroup() as tasks:
+            tasks.create_task(self.fetch_feeds(feeds, parsed, stats.fetch, new_deals))
+            tasks.create_task(self.match_feeds(parsed, stats))
 
         logger.info(
             "Found %s new deals (%s)",
-            new_deals_amount,
-            " | ".join([f"{feeds[key].__name__}: {len(deals)}" for key, deals in enumerate(deals_list)]),
+            sum(new_deals.values()),
+            " | ".join(f"{feed.__name__}: {new_deals.get(feed, 0)} ({feed.poll_stats()})" for feed in feeds),
         )
+        logger.info("Pipeline: %s", stats)
+        logger.info("Deal cache: %s", DealCache.stats())
+        logger.info("Telegram connections: %s", self.bot.connection_stats())
+
+        return new_deals
+
+    @classmethod
+    async def fetch_feeds(
+        cls,
+        feeds: Sequence[type[AbstractFeed]],
+        parsed: Queue[tuple[type[AbstractFeed], list[DealModel]]],
+        stats: StageStats,
+        new_deals: dict[type[AbstractFeed], int],
+    ) -> None:
+        async def fetch_feed(feed: type[AbstractFeed]) -> None:
+            start = time.perf_counter()
+            try:
+                deals = await feed.get_new_deals()
+            except Exception:
+                # The deals of a failed feed aren't marked as seen, so they are parsed again by the next poll
+                logger.exception("Error while parsing %s", feed.__name__)
+                deals = []
+            stats.add(time.perf_counter() - start)
+            new_deals[feed] = len(deals)
+
+            if deals:
+                await parsed.put((feed, deals))
+                stats.queued(parsed.qsize())
+
+        try:
+            async with asyncio.TaskGroup() as tasks:
+                for feed in feeds:
+                    tasks.create_task(fetch_feed(feed))
+        finally:
+            parsed.shutdown()
+
+    async def match_feeds(
+        self, parsed: Queue[tuple[type[AbstractFeed], list[DealModel]]], stats: PipelineStats
+    ) -> None:
+        while True:
+            try:
+                feed, deals = await parsed.get()
+            except QueueShutDown:
+                return
 
-        if new_deals_amount == 0:
-            return
+            try:
+                await self.match_feed(feed, deals, stats)
+            except Exception:
+                logger.exception("Error while matching %s", feed.__name__)
 
-        all_notifications = NotificationClient().fetch_all_active()
-        for feed_number, deals in enumerate(deals_list):
-            for deal in deals:
-                sent_to_users = []
-                for notification, user in all_notifications:
-                    if user.id in sent_to_users or not feeds[feed_number].consider_deals(notification, user):
-                        continue
+    async def match_feed(self, feed: type[AbstractFeed], deals: list[DealModel], stats: PipelineStats) -> None:
+        start = time.perf_counter()
+        matcher = self.get_matcher(feed)
+        matcher.stats = MatchStats()
+        entries = []
+        for deal, matches in zip(deals, matcher.match_deals(deals), strict=True):
+            sent_to_users = set()
+            for notification, user in matches:
+                if user.id in sent_to_users:
+                    continue
 
-                    if self.notification_matches_deal(notification, deal):
-                        await self.bot.send_deal(deal, notification, user)
-                        sent_to_users.append(notification.user_id)
+                entries.append(OutboxSender.entry(deal, notification, user))
+                sent_to_users.add(user.id)
+
+        stats.queued_deliveries += await SeenItemClient.run(feed.get_seen_items().flush, deals, entries)
+        stats.match.add(time.perf_counter() - start)
+        logger.info("%s: matched %s query groups: %s", feed.__name__, matcher.group_count, matcher.stats)
+
+        if entries:
+            self.outbox_sender.wake()
+
+    @classmethod
+    def get_matcher(cls, feed: type[AbstractFeed]) -> Matcher:
+        version, subscriptions = SubscriptionRegistry.snapshot()
+
+        if cls._matchers_version != version:
+            cls._matchers = {}
+            cls._matchers_version = version
+
+        if feed not in cls._matchers:
+            cls._matchers[feed] = create_matcher(
+                feed.eligible_subscriptions(subscriptions), cls.cached_notification_matches_deal
+            )
+
+        return cls._matchers[feed]
+
+    @classmethod
+    def cached_notification_matches_deal(cls, notification: NotificationModel, deal: DealModel) -> bool:
+        return DealCache.matches(notification, deal, cls.notification_matches_deal)
 
     @classmethod
     def notification_matches_deal(
@@ -1,26 +1,54 @@
 from __future__ import annotations
 
-import asyncio
+import json
 import logging
 import re
+import time
 from abc import ABC, abstractmethod
 from datetime import datetime
+from http import HTTPStatus
 from pathlib import Path
+from typing import TYPE_CHECKING
+from xml.etree.ElementTree import Element, ParseError, XMLPullParser  # noqa: S405
 
-import requests
+from aiohttp import ClientError
 from feedparser import FeedParserDict, parse
-from requests import Response
-from urllib3.exceptions import HTTPError
 
 from src import config
+from src.db.seen_item_client import SeenItemClient
 from src.models import DealModel, NotificationModel, UserModel
+from src.rss.deal_cache import DealCache
+from src.rss.http_client import HttpClient
+from src.rss.parser_pool import ParserPool
+from src.rss.seen_items import SeenItems
 from src.utils import parse_price, remove_html_tags
 
+if TYPE_CHECKING:
+    from collections.abc import Container, Iterator, Mapping, Sequence
+
+    from src.models import Subscription
+
 logger = logging.getLogger(__name__)
 
+STREAM_CHUNK_SIZE = 16384
+MEDIA_NAMESPACE = "http://search.yahoo.com/mrss/"
+RSS_FIELDS = {
+    "title": "title",
+    "link": "link",
+    "description": "summary",
+    "pubDate": "published",
+    "guid": "id",
+}
+
 
 class AbstractFeed(ABC):
     _last_update: datetime | None = None
+    _validators: dict[str, str] | None = None
+    _seen_items: SeenItems | None = None
+    _sorted_by_date = True
+    _polls = 0
+    _unchanged_polls = 0
+    _parse_time = 0.0
     _feed = ""
 
     @classmethod
@@ -28,6 +56,7 @@ class AbstractFeed(ABC):
         if cls._last_update:
             return cls._last_update
 
+        cls._last_update = datetime.min.replace(tzinfo=config.TIMEZONE)
         if Path.is_file(cls.last_update_file()):
             with Path.open(
                 cls.last_update_file(),
@@ -35,33 +64,81 @@ class AbstractFeed(ABC):
             ) as last_update_file:
                 file_content = last_update_file.read()
                 try:
-                    return datetime.fromisoformat(file_content).replace(tzinfo=config.TIMEZONE)
+                    cls._last_update = datetime.fromisoformat(file_content).replace(tzinfo=config.TIMEZONE)
                 except ValueError:
-                    return datetime.fromtimestamp(float(file_content), tz=config.TIMEZONE)
+                    cls._last_update = datetime.fromtimestamp(float(file_content), tz=config.TIMEZONE)
+
+        return cls._last_update
+
+    @classmethod
+    def last_update_file(cls) -> Path:
+        return Path(f"{config.FILE_DIR}/last_update_{cls.__name__}")
+
+    @classmethod
+    def get_seen_items(cls) -> SeenItems:
+        if cls._seen_items is None:
+            cls._seen_items = SeenItems(cls.__name__)
+
+        return cls._seen_items
+
+    @classmethod
+    async def load_seen_items(cls) -> SeenItems:
+        # Load the seen items in the database thread before their first use
+        if cls._seen_items is None:
+            cls._seen_items = await SeenItemClient.run(SeenItems, cls.__name__)
 
-        return datetime.min.replace(tzinfo=config.TIMEZONE)
+        return cls._seen_items
 
     @classmethod
-    def set_last_update(cls, last_update: datetime) -> None:
-        if last_update <= cls.get_last_update():
+    def get_horizon(cls) -> datetime:
+        # Deals published before the horizon are ignored without a lookup. Feeds sorted by date allow a grace period
+        # for deals published out of order, the other feeds anything within the lifetime of the seen items. Until a
+        # deal was seen, the last update of the previous timestamp-based tracking is used.
+        window = config.SEEN_ITEMS_GRACE if cls._sorted_by_date else config.SEEN_ITEMS_TTL
+
+        return cls.get_seen_items().horizon(window) or cls.get_last_update()
+
+    @classmethod
+    def get_validators(cls) -> dict[str, str]:
+        if cls._validators is not None:
+            return cls._validators
+
+        cls._validators = {}
+        if Path.is_file(cls.validators_file()):
+            try:
+                cls._validators = json.loads(cls.validators_file().read_text(encoding="utf-8"))
+            except ValueError:
+                logger.warning("Invalid validators file %s", cls.validators_file())
+
+        return cls._validators
+
+    @classmethod
+    def set_validators(cls, headers: Mapping[str, str]) -> None:
+        validators = {key: value for key in ("ETag", "Last-Modified") if (value := headers.get(key))}
+        if validators == cls.get_validators():
             return
 
-        logger.debug(
-            'update last-update from "%s" to "%s"',
-            cls.get_last_update(),
-            last_update,
-        )
+        cls._validators = validators
+        cls.validators_file().write_text(json.dumps(validators), encoding="utf-8")
 
-        cls._last_update = last_update
-        mode = "r+" if Path.is_file(cls.last_update_file()) else "w"
-        with Path.open(cls.last_update_file(), mode, encoding="utf-8") as last_update_file:
-            last_update_file.seek(0, 0)
-            last_update_file.write(last_update.isoformat())
-            last_update_file.close()
+    @classmethod
+    def validators_file(cls) -> Path:
+        return Path(f"{config.FILE_DIR}/validators_{cls.__name__}")
 
     @classmethod
-    def last_update_file(cls) -> Path:
-        return Path(f"{config.FILE_DIR}/last_update_{cls.__name__}")
+    def conditional_headers(cls) -> dict[str, str]:
+        validators = cls.get_validators()
+        headers = {}
+        if etag := validators.get("ETag"):
+            headers["If-None-Match"] = etag
+        if last_modified := validators.get("Last-Modified"):
+            headers["If-Modified-Since"] = last_modified
+
+        return headers
+
+    @classmethod
+    def poll_stats(cls) -> str:
+        return f"{cls._unchanged_polls}/{cls._polls} unchanged, last parsed in {cls._parse_time * 1000:.1f} ms"
 
     @classmethod
     @abstractmethod
@@ -69,49 +146,138 @@ class AbstractFeed(ABC):
         pass
 
     @classmethod
-    def parse_feed(cls, feed_content: bytes) -> list[DealModel]:
-        feed = parse(feed_content)
-        last_update_ts = cls.get_last_update()
-        last_update = datetime.min.replace(tzinfo=config.TIMEZONE)
+    def parse_deals(
+        cls,
+        feed_content: bytes,
+        horizon: datetime,  # noqa: ARG003
+        seen: Container[str] = (),  # noqa: ARG003
+        cached: Container[str] = (),  # noqa: ARG003
+    ) -> list[DealModel | str]:
+        return [cls.parse_deal(entry) for entry in parse(feed_content)["entries"]]
 
-        deals = []
-        for entry in feed["entries"]:
-            deal = cls.parse_deal(entry)
-            if deal.title and deal.published > last_update_ts:
+    @classmethod
+    async def parse_feed(cls, feed_content: bytes) -> list[DealModel]:
+        seen_items = await cls.load_seen_items()
+        horizon = cls.get_horizon()
+
+        start = time.perf_counter()
+        parsed_deals = await ParserPool.parse_deals(cls, feed_content, horizon, seen_items)
+        cls._parse_time = time.perf_counter() - start
+
+        # The new deals are marked as seen after matching, when their outbox entries are saved
+        deals: dict[str, DealModel] = {}
+        for deal in parsed_deals:
+            if deal.title and deal.published > horizon and deal.key not in seen_items and deal.key not in deals:
                 logger.debug('Added Deal with title "%s"', deal.title)
-                deals.append(deal)
-                last_update = max(last_update, deal.published)
+                deals[deal.key] = deal
+                DealCache.put(deal)
 
-        logger.debug("Parsed %s, found %s new deals", cls._feed, len(deals))
+        logger.debug("Parsed %s in %.1f ms, found %s new deals", cls._feed, cls._parse_time * 1000, len(deals))
 
-        cls.set_last_update(last_update)
-
-        return deals
+        return list(deals.values())
 
     @classmethod
     async def get_new_deals(cls) -> list[DealModel]:
         try:
-            response: Response = await asyncio.to_thread(
-                requests.get, url=cls._feed, headers={"User-Agent": "Telegram-Bot"}, timeout=30
-            )
+            async with HttpClient.get_session().get(cls._feed, headers=cls.conditional_headers()) as response:
+                content = await response.read()
+        except (OSError, ClientError):
+            logger.exception("Fetching %s failed.", cls._feed)
 
-            if response.status_code < 200 or response.status_code >= 300:  # noqa: PLR2004
-                logger.error("Failed to fetch %s. Response (%s): %s", cls._feed, response.status_code, response.content)
+            return []
 
-            return cls.parse_feed(response.content)
+        cls._polls += 1
+        if response.status == HTTPStatus.NOT_MODIFIED:
+            cls._unchanged_polls += 1
+            logger.debug("%s not modified since last poll", cls._feed)
 
-        except (OSError, HTTPError):
-            logger.exception("Fetching %s failed.", cls._feed)
+            return []
+
+        if response.status < 200 or response.status >= 300:  # noqa: PLR2004
+            logger.error("Failed to fetch %s. Response (%s): %s", cls._feed, response.status, content)
 
-        return []
+            return await cls.parse_feed(content)
+
+        deals = await cls.parse_feed(content)
+        cls.set_validators(response.headers)
+
+        return deals
 
     @classmethod
     @abstractmethod
     def consider_deals(cls, notification: NotificationModel, user: UserModel) -> bool:
         pass
 
+    @classmethod
+    def eligible_subscriptions(cls, subscriptions: Sequence[Subscription]) -> list[Subscription]:
+        return [(notification, user) for notification, user in subscriptions if cls.consider_deals(notification, user)]
+
 
 class PepperFeed:
+    _sorted_by_date = True
+
+    @classmethod
+    def parse_deals(
+        cls, feed_content: bytes, horizon: datetime, seen: Container[str] = (), cached: Container[str] = ()
+    ) -> list[DealModel | str]:
+        try:
+            return list(cls.stream_deals(feed_content, horizon, seen, cached))
+        except ParseError:
+            logger.warning("Streaming %s failed. Fall back to feedparser.", cls.__name__, exc_info=True)
+
+        return [cls.parse_deal(entry) for entry in parse(feed_content)["entries"]]
+
+    @classmethod
+    def stream_deals(
+        cls, feed_content: bytes, horizon: datetime, seen: Container[str] = (), cached: Container[str] = ()
+    ) -> Iterator[DealModel | str]:
+        # Parse incrementally and only decode unseen items newer than the horizon. Items another feed already decoded
+        # are returned by their DealCache key. Feeds sorted by date stop at the first item that is not newer.
+        parser = XMLPullParser(events=("end",))
+        found_items = False
+
+        for offset in range(0, len(feed_content), STREAM_CHUNK_SIZE):
+            parser.feed(feed_content[offset : offset + STREAM_CHUNK_SIZE])
+            for event in parser.read_events():
+                element = event[-1]
+                if not isinstance(element, Element) or element.tag != "item":
+                    continue
+
+                found_items = True
+                if cls.parse_datetime(element.findtext("pubDate")) <= horizon:
+                    if cls._sorted_by_date:
+                        return
+                elif cls.item_key(element) not in seen:
+                    key = DealCache.deal_key(element.findtext("link") or "")
+                    yield key if key in cached else cls.parse_deal(cls.parse_item(element))
+
+                element.clear()
+
+        parser.close()
+        if not found_items:
+            msg = "No RSS items found"
+            raise ParseError(msg)
+
+    @classmethod
+    def item_key(cls, item: Element) -> str:
+        # Same key as DealModel.key of the parsed item, whose fields are stripped by parse_item
+        return (item.findtext("guid") or "").strip() or (item.findtext("link") or "").strip()
+
+    @classmethod
+    def parse_item(cls, item: Element) -> FeedParserDict:
+        entry = FeedParserDict()
+        for child in item:
+            if child.tag == "category":
+                entry.setdefault("tags", []).append({"term": (child.text or "").strip()})
+            elif child.tag in RSS_FIELDS:
+                entry.setdefault(RSS_FIELDS[child.tag], (child.text or "").strip())
+            elif child.tag.endswith("}merchant"):
+                entry["pepper_merchant"] = dict(child.attrib)
+            elif child.tag == f"{{{MEDIA_NAMESPACE}}}content":
+                entry.setdefault("media_content", []).append(dict(child.attrib))
+
+        return entry
+
     @classmethod
     def parse_deal(cls, entry: FeedParserDict) -> DealModel:
         return DealModel(
@@ -121,16 +287,17 @@ class PepperFeed:
             price=parse_price(entry.get("pepper_merchant", {}).get("price", "")),
             link=entry.get("link", ""),
             published=cls.parse_datetime(entry.get("published")),
+            guid=entry.get("id", ""),
             image_url=(entry["media_content"][0]["url"]).replace("150x150/qt/55", "768x768/qt/60"),
             description=cls.parse_description(entry.get("summary", "")),
         )
 
     @classmethod
-    def parse_datetime(cls, datetime_str: str) -> datetime:
-        try:
+    def parse_datetime(cls, datetime_str: str | None) -> datetime:
+        if datetime_str is not None:
             return datetime.strptime(datetime_str, "%a, %d %b %Y %H:%M:%S %z").replace(tzinfo=config.TIMEZONE)
-        except TypeError:
-            logger.warning("Got invalid date: %s", datetime_str)
+
+        logger.warning("Got invalid date: %s", datetime_str)
 
         return datetime.now(tz=config.TIMEZONE)
 
@@ -145,6 +312,8 @@ class PepperFeed:
 
 class MyDealzAllFeed(PepperFeed, AbstractFeed):
     _last_update = None
+    _validators = None
+    _seen_items = None
     _feed = "https://www.mydealz.de/rss/alles"
 
     @classmethod
@@ -154,6 +323,9 @@ class MyDealzAllFeed(PepperFeed, AbstractFeed):
 
 class MyDealzHotFeed(PepperFeed, AbstractFeed):
     _last_update = None
+    _validators = None
+    _seen_items = None
+    _sorted_by_date = False
     _feed = "https://www.mydealz.de/rss/hot"
 
     @classmethod
@@ -163,6 +335,8 @@ class MyDealzHotFeed(PepperFeed, AbstractFeed):
 
 class PreisjaegerAllFeed(PepperFeed, AbstractFeed):
     _last_update = None
+    _validators = None
+    _seen_items = None
     _feed = "https://www.preisjaeger.at/rss/alle"
 
     @classmethod
@@ -172,6 +346,9 @@ class PreisjaegerAllFeed(PepperFeed, AbstractFeed):
 
 class PreisjaegerHotFeed(PepperFeed, AbstractFeed):
     _last_update = None
+    _validators = None
+    _seen_items = None
+    _sorted_by_date = False
     _feed = "https://www.preisjaeger.at/rss/hot"
 
     @classmethod
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import logging
+from typing import ClassVar
+
+from aiohttp import ClientSession, ClientTimeout, TCPConnector
+
+from src import config
+
+logger = logging.getLogger(__name__)
+
+
+class HttpClient:
+    """Long-lived HTTP session for fetching feeds."""
+
+    _session: ClassVar[ClientSession | None] = None
+
+    @classmethod
+    def get_session(cls) -> ClientSession:
+        if cls._session is None or cls._session.closed:
+            cls._session = ClientSession(
+                connector=TCPConnector(
+                    limit_per_host=config.HTTP_CONNECTIONS_PER_HOST,
+                    keepalive_timeout=config.HTTP_KEEPALIVE_TIMEOUT,
+                ),
+                timeout=ClientTimeout(total=config.HTTP_TIMEOUT, connect=config.HTTP_CONNECT_TIMEOUT),
+                headers={"User-Agent": "Telegram-Bot", "Accept-Encoding": "gzip, deflate"},
+            )
+
+        return cls._session
+
+    @classmethod
+    async def close(cls) -> None:
+        if cls._session and not cls._session.closed:
+            await cls._session.close()
+            logger.debug("Closed feed http-session")
+
+        cls._session = None
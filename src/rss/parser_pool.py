@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait
+from typing import TYPE_CHECKING, ClassVar
+
+from src import config
+from src.rss.deal_cache import DealCache
+
+if TYPE_CHECKING:
+    from collections.abc import Collection
+    from datetime import datetime
+
+    from src.models import DealModel
+    from src.rss.feeds import AbstractFeed
+
+logger = logging.getLogger(__name__)
+
+
+def warm_up() -> None:
+    # Import the parsing modules and run the parsers once, so the first feed isn't slowed down by a cold worker
+    from src.rss.feeds import PepperFeed  # noqa: PLC0415
+    from src.utils import parse_price  # noqa: PLC0415
+
+    PepperFeed.parse_description("<strong>1 €</strong>warm-up")
+    parse_price("1 €")
+
+
+class ParserPool:
+    """Worker processes parsing the raw feed contents, so decoding deals never blocks the event loop."""
+
+    _executor: ClassVar[ProcessPoolExecutor | None] = None
+
+    @classmethod
+    def start(cls) -> None:
+        if cls._executor is not None or config.PARSE_WORKERS < 1:
+            return
+
+        # Spawn fresh interpreters, forking the multithreaded bot process isn't safe
+        cls._executor = ProcessPoolExecutor(
+            max_workers=config.PARSE_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+        wait([cls._executor.submit(warm_up) for _ in range(config.PARSE_WORKERS)])
+        logger.info("Started %s feed parser processes", config.PARSE_WORKERS)
+
+    @classmethod
+    def shutdown(cls) -> None:
+        if cls._executor is not None:
+            cls._executor.shutdown(cancel_futures=True)
+            logger.debug("Stopped feed parser processes")
+
+        cls._executor = None
+
+    @classmethod
+    async def parse_deals(
+        cls,
+        feed: type[AbstractFeed],
+        feed_content: bytes,
+        horizon: datetime,
+        seen: Collection[str],
+    ) -> list[DealModel]:
+        cached = DealCache.snapshot()
+        if cls._executor is None:
+            parsed = feed.parse_deals(feed_content, horizon, seen, cached.keys())
+        else:
+            parsed = await asyncio.get_running_loop().run_in_executor(
+                cls._executor, feed.parse_deals, feed_content, horizon, frozenset(seen), frozenset(cached)
+            )
+
+        return DealCache.resolve(parsed, cached)
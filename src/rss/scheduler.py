@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING
+
+from src import config
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+    from src.rss.feeds import AbstractFeed
+
+RATE_SMOOTHING = 0.3
+
+
+@dataclass
+class FeedSchedule:
+    feed: type[AbstractFeed]
+    interval: float
+    next_poll: float
+    last_poll: float | None = None
+    rate: float | None = None  # smoothed new items per second
+
+    def __str__(self) -> str:
+        rate = f"{self.rate * 60:.2f}/min" if self.rate is not None else "unknown"
+        return f"{self.feed.__name__}: every {self.interval:.0f}s, {rate} new deals"
+
+
+class FeedScheduler:
+    """Keeps a separate next poll time for every feed and adapts the poll interval to the feed's activity."""
+
+    def __init__(
+        self,
+        feeds: Sequence[type[AbstractFeed]],
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._clock = clock
+        now = clock()
+        interval = self._bounded(config.PARSE_INTERVAL)
+        self._schedules = {feed: FeedSchedule(feed=feed, interval=interval, next_poll=now) for feed in feeds}
+
+    def due_feeds(self) -> list[type[AbstractFeed]]:
+        now = self._clock()
+
+        return [feed for feed, schedule in self._schedules.items() if schedule.next_poll <= now]
+
+    def seconds_until_next_poll(self) -> float:
+        next_poll = min((schedule.next_poll for schedule in self._schedules.values()), default=self._clock())
+
+        return max(next_poll - self._clock(), 0)
+
+    def record_poll(self, feed: type[AbstractFeed], new_deals: int) -> None:
+        schedule = self._schedules[feed]
+        now = self._clock()
+
+        # The first poll after a start contains everything since the last run and says nothing about the rate.
+        if schedule.last_poll is not None and now > schedule.last_poll:
+            rate = new_deals / (now - schedule.last_poll)
+            schedule.rate = (
+                rate if schedule.rate is None else RATE_SMOOTHING * rate + (1 - RATE_SMOOTHING) * schedule.rate
+            )
+            schedule.interval = self._bounded(
+                config.POLL_TARGET_DEALS / schedule.rate if schedule.rate else config.POLL_MAX_INTERVAL
+            )
+
+        schedule.last_poll = now
+        schedule.next_poll = now + schedule.interval * (1 + random.uniform(-config.POLL_JITTER, config.POLL_JITTER))  # noqa: S311
+
+    def schedule(self) -> list[FeedSchedule]:
+        return sorted(self._schedules.values(), key=lambda schedule: schedule.next_poll)
+
+    def next_poll_time(self, schedule: FeedSchedule) -> datetime:
+        return datetime.now(tz=config.TIMEZONE) + timedelta(seconds=schedule.next_poll - self._clock())
+
+    def __str__(self) -> str:
+        return " | ".join(f"{schedule}, next {self.next_poll_time(schedule):%H:%M:%S}" for schedule in self.schedule())
+
+    @classmethod
+    def _bounded(cls, interval: float) -> float:
+        return min(max(interval, config.POLL_MIN_INTERVAL), config.POLL_MAX_INTERVAL)
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import logging
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+from src import config
+from src.db.seen_item_client import SeenItemClient
+from src.models import DealModel, OutboxModel, SeenItemModel
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+class SeenItems:
+    """Keys of the deals a feed already processed, to skip them with a membership check."""
+
+    def __init__(self, feed: str):
+        self.feed = feed
+        self._items: OrderedDict[str, float] = OrderedDict()
+        self._newest_published: float | None = None
+        self._added: dict[str, SeenItemModel] = {}
+        self._removed: set[str] = set()
+
+        for item in SeenItemClient.fetch_by_feed(feed):
+            self._items[item.guid] = item.seen_at
+            self._newest_published = max(item.published, self._newest_published or item.published)
+
+        self._evict(time.time())
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._items
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def add(self, key: str, published: datetime) -> None:
+        if key in self._items:
+            return
+
+        now = time.time()
+        self._added[key] = SeenItemModel(feed=self.feed, guid=key, published=published.timestamp(), seen_at=now)
+        self._remember(key, published.timestamp(), now)
+
+    def horizon(self, window: float) -> datetime | None:
+        if self._newest_published is None:
+            return None
+
+        return datetime.fromtimestamp(self._newest_published - window, tz=config.TIMEZONE)
+
+    def flush(self, deals: Sequence[DealModel] = (), outbox: Sequence[OutboxModel] = ()) -> int:
+        # The deals are only marked as seen once they were saved together with their outbox entries
+        now = time.time()
+        new_items = {
+            deal.key: SeenItemModel(feed=self.feed, guid=deal.key, published=deal.published.timestamp(), seen_at=now)
+            for deal in deals
+            if deal.key not in self._items
+        }
+        added = [*self._added.values(), *new_items.values()]
+        if not added and not self._removed and not outbox:
+            return 0
+
+        queued = SeenItemClient.save(self.feed, added, self._removed, outbox)
+        logger.debug("%s: saved %s and removed %s seen items", self.feed, len(added), len(self._removed))
+        self._added = {}
+        self._removed = set()
+        for item in new_items.values():
+            self._remember(item.guid, item.published, now)
+
+        return queued
+
+    def _remember(self, key: str, published: float, now: float) -> None:
+        self._items[key] = now
+        self._removed.discard(key)
+        self._newest_published = max(published, self._newest_published or published)
+        self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        expired = now - config.SEEN_ITEMS_TTL
+        while self._items and (len(self._items) > config.SEEN_ITEMS_MAX or next(iter(self._items.values())) < expired):
+            key, _ = self._items.popitem(last=False)
+            if self._added.pop(key, None) is None:
+                self._removed.add(key)
@@ -1,4 +1,6 @@
 import logging
+from collections.abc import Sequence
+from typing import ClassVar
 
 from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
@@ -9,20 +11,26 @@ from aiogram.exceptions import (
     TelegramForbiddenError,
     TelegramMigrateToChat,
     TelegramNotFound,
+    TelegramRetryAfter,
 )
+from aiogram.types import InlineKeyboardMarkup
 
 from src import config
 from src.db.db_utilities import update_user_id
 from src.db.user_client import UserClient
 from src.models import DealModel, NotificationModel, UserModel
 from src.rss.feedparser import FeedParser
-from src.telegram.keyboards import Keyboards
+from src.telegram.broadcaster import Broadcaster
+from src.telegram.delivery import RateLimiter
+from src.telegram.image_cache import ImageCache
 from src.telegram.messages import Messages
+from src.telegram.render_cache import RenderCache
 from src.telegram.routers.admin_router import admin_router
 from src.telegram.routers.base_router import base_router
 from src.telegram.routers.error_router import error_router
 from src.telegram.routers.notification_router import notification_router
 from src.telegram.routers.settings_router import settings_router
+from src.telegram.session import TelegramSession
 
 logger = logging.getLogger(__name__)
 
@@ -37,8 +45,30 @@ class TelegramBot:
         msg = "Environment-variable BOT_TOKEN is missing!"
         raise NotImplementedError(msg)
 
+    _bot: ClassVar[Bot | None] = None
+    _session: ClassVar[TelegramSession | None] = None
+    # Telegram's global limit applies to the bot, so deals and broadcasts share one rate limiter
+    rate_limiter: ClassVar[RateLimiter] = RateLimiter()
+
+    @classmethod
+    def get_bot(cls) -> Bot:
+        if cls._bot is None:
+            cls._session = TelegramSession(limit=config.TELEGRAM_CONNECTIONS)
+            cls._bot = Bot(token=config.BOT_TOKEN, session=cls._session, default=properties)
+
+        return cls._bot
+
+    @classmethod
+    async def close(cls) -> None:
+        if cls._bot is not None:
+            await cls._bot.session.close()
+
+    @classmethod
+    def connection_stats(cls) -> str:
+        return str(cls._session) if cls._session else "no connections"
+
     async def run_bot(self) -> None:
-        dp = Dispatcher()
+        dp = Dispatcher(rate_limiter=self.rate_limiter)
 
         if config.OWN_ID:
             dp.include_router(admin_router)
@@ -48,41 +78,74 @@ class TelegramBot:
         feedparser = FeedParser(self)
         dp.startup.register(feedparser.start)
         dp.shutdown.register(feedparser.exit)
+        dp.startup.register(Broadcaster.resume)
+        dp.shutdown.register(Broadcaster.exit)
 
-        await dp.start_polling(Bot(token=config.BOT_TOKEN, default=properties))
+        await dp.start_polling(self.get_bot())
 
     @classmethod
     async def send_deal(cls, deal: DealModel, notification: NotificationModel, user: UserModel) -> None:
-        message = Messages.deal_msg(deal, notification)
-        keyboard = Keyboards.deal_kb(deal.link, notification)
-
-        bot = Bot(token=config.BOT_TOKEN, default=properties)
-
-        send_message = not user.send_images
-        if user.send_images:
-            try:
-                await bot.send_photo(
-                    chat_id=user.id, photo=deal.image_url, caption=message, reply_markup=keyboard, request_timeout=30
-                )
-            except TelegramAPIError:
-                send_message = True
-
-        if send_message:
-            try:
-                await bot.send_message(chat_id=user.id, text=message, reply_markup=keyboard, request_timeout=30)
-            except (TelegramForbiddenError, TelegramNotFound):
-                logger.info("User %s blocked the bot. Disable him", notification.user_id)
-                UserClient.disable(user.id)
-            except TelegramMigrateToChat as e:
-                logger.info("Migrate user-id %s to %s", user.id, e.migrate_to_chat_id)
-                update_user_id(user, e.migrate_to_chat_id)
-            except TelegramBadRequest as e:
-                if "chat not found" in e.message.lower():
-                    logger.info("Chat %s not found. Disable user.", user.id)
-                    UserClient.disable(user.id)
-                else:
-                    logger.exception("Unexpected exception. User: %s. Message: %s", user.id, message)
-            except TelegramAPIError:
-                logger.exception("Could not send deal")
-
-        await bot.session.close()
+        message = RenderCache.deal_msg(deal, notification)
+        keyboard = RenderCache.deal_kb(deal, notification)
+
+        if user.send_images and await cls.send_photo(deal, user, message, keyboard):
+            return
+
+        await cls.send_message(user, message, keyboard)
+
+    @classmethod
+    async def send_photo(cls, deal: DealModel, user: UserModel, message: str, keyboard: InlineKeyboardMarkup) -> bool:
+        photo = await ImageCache.acquire(deal.image_url)
+        if photo is None:
+            return False
+
+        uploading = photo == deal.image_url
+        file_id = None
+        try:
+            sent = await cls.get_bot().send_photo(
+                chat_id=user.id, photo=photo, caption=message, reply_markup=keyboard, request_timeout=30
+            )
+        except TelegramRetryAfter:
+            raise  # Let the delivery queue retry after the flood-wait
+        except TelegramAPIError as e:
+            if uploading and isinstance(e, TelegramBadRequest) and not cls._is_chat_error(e):
+                ImageCache.mark_unusable(deal.image_url)
+            logger.debug("Could not send photo to %s, send text instead", user.id, exc_info=True)
+
+            return False
+        else:
+            file_id = sent.photo[-1].file_id if sent.photo else None
+
+            return True
+        finally:
+            if uploading:
+                ImageCache.release(deal.image_url, file_id)
+
+    @staticmethod
+    def _is_chat_error(error: TelegramBadRequest) -> bool:
+        # Errors caused by the chat (e.g. no rights to send photos) don't make the image unusable for other chats
+        return any(reason in error.message.lower() for reason in ("chat", "rights"))
+
+    @classmethod
+    async def send_digest(cls, user: UserModel, deals: Sequence[tuple[DealModel, NotificationModel]]) -> None:
+        for message in Messages.deal_digest(deals):
+            await cls.send_message(user, message)
+
+    @classmethod
+    async def send_message(cls, user: UserModel, message: str, keyboard: InlineKeyboardMarkup | None = None) -> None:
+        # Only permanent errors are handled here. Temporary errors (flood-waits, network- and server-errors) are raised,
+        # so the delivery is retried.
+        try:
+            await cls.get_bot().send_message(chat_id=user.id, text=message, reply_markup=keyboard, request_timeout=30)
+        except (TelegramForbiddenError, TelegramNotFound):
+            logger.info("User %s blocked the bot. Disable him", user.id)
+            await UserClient.run(UserClient.disable, user.id)
+        except TelegramMigrateToChat as e:
+            logger.info("Migrate user-id %s to %s", user.id, e.migrate_to_chat_id)
+            await UserClient.run(update_user_id, user, e.migrate_to_chat_id)
+        except TelegramBadRequest as e:
+            if "chat not found" in e.message.lower():
+                logger.info("Chat %s not found. Disable user.", user.id)
+                await UserClient.run(UserClient.disable, user.id)
+            else:
+                logger.exception("Unexpected exception. User: %s. Message: %s", user.id, message)
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from asyncio import Task
+from typing import TYPE_CHECKING, ClassVar
+
+from aiogram.exceptions import (
+    TelegramAPIError,
+    TelegramForbiddenError,
+    TelegramMigrateToChat,
+    TelegramNotFound,
+    TelegramRetryAfter,
+)
+
+from src import config
+from src.db.broadcast_client import BroadcastClient
+from src.db.db_utilities import update_user_id
+from src.db.user_client import UserClient
+from src.models import BroadcastModel, RecipientStatus
+from src.telegram.delivery import DeliveryQueue, DeliveryStats, RateLimiter
+from src.telegram.messages import Messages
+
+if TYPE_CHECKING:
+    from aiogram import Bot
+
+logger = logging.getLogger(__name__)
+
+
+class Broadcaster:
+    """Sends admin broadcasts as persisted jobs."""
+
+    _tasks: ClassVar[set[Task[DeliveryStats]]] = set()
+
+    @classmethod
+    async def start(
+        cls, bot: Bot, rate_limiter: RateLimiter, message_id: int, progress_message_id: int | None = None
+    ) -> BroadcastModel:
+        broadcast = await BroadcastClient.run(BroadcastClient.create, message_id)
+        if progress_message_id is None:
+            progress = await bot.send_message(
+                chat_id=cls._admin_id(),
+                text=Messages.broadcast_progress(
+                    await BroadcastClient.run(BroadcastClient.count_recipients, broadcast.id)
+                ),
+            )
+            progress_message_id = progress.message_id
+
+        broadcast = await BroadcastClient.run(BroadcastClient.set_progress_message, broadcast, progress_message_id)
+        cls._create_task(bot, broadcast, rate_limiter)
+
+        return broadcast
+
+    @classmethod
+    async def resume(cls, bot: Bot, rate_limiter: RateLimiter) -> None:
+        for broadcast in await BroadcastClient.run(BroadcastClient.fetch_unfinished):
+            logger.info("Resume broadcast %s", broadcast.id)
+            cls._create_task(bot, broadcast, rate_limiter)
+
+    @classmethod
+    async def exit(cls) -> None:
+        # Unsent recipients stay pending and are sent after the next start
+        for task in cls._tasks:
+            task.cancel()
+        await asyncio.gather(*cls._tasks, return_exceptions=True)
+
+    @classmethod
+    def _create_task(cls, bot: Bot, broadcast: BroadcastModel, rate_limiter: RateLimiter) -> None:
+        task = asyncio.create_task(cls.run(bot, broadcast, rate_limiter), name=f"broadcast-{broadcast.id}")
+        cls._tasks.add(task)
+        task.add_done_callback(cls._tasks.discard)
+
+    @classmethod
+    async def run(cls, bot: Bot, broadcast: BroadcastModel, rate_limiter: RateLimiter) -> DeliveryStats:
+        stats = DeliveryStats()
+
+        while user_ids := await BroadcastClient.run(
+            BroadcastClient.fetch_pending_recipients, broadcast.id, config.BROADCAST_BATCH_SIZE
+        ):
+            results = await cls.send_batch(bot, broadcast, user_ids, rate_limiter, stats)
+            if blocked := [user_id for user_id, status in results.items() if status == RecipientStatus.BLOCKED]:
+                logger.info("%s users blocked the bot. Disable them", len(blocked))
+                await UserClient.run(UserClient.disable_all, blocked)
+
+            await cls.report_progress(bot, broadcast, stats)
+
+        broadcast = await BroadcastClient.run(BroadcastClient.finish, broadcast)
+        await cls.report_progress(bot, broadcast, stats)
+        logger.info("Broadcast %s finished: %s", broadcast.id, stats)
+
+        return stats
+
+    @classmethod
+    async def send_batch(
+        cls,
+        bot: Bot,
+        broadcast: BroadcastModel,
+        user_ids: list[int],
+        rate_limiter: RateLimiter,
+        stats: DeliveryStats,
+    ) -> dict[int, RecipientStatus]:
+        results: dict[int, RecipientStatus] = {}
+
+        async def send(user_id: int) -> None:
+            status = await cls.send_copy(bot, user_id, broadcast.message_id)
+            await BroadcastClient.run(BroadcastClient.save_results, broadcast.id, {user_id: status})
+            results[user_id] = status
+
+        deliveries: DeliveryQueue[int] = DeliveryQueue(send, rate_limiter, len(user_ids), stats)
+        async with asyncio.TaskGroup() as tasks:
+            tasks.create_task(deliveries.run(config.PIPELINE_SENDERS))
+            for user_id in user_ids:
+                await deliveries.put(user_id, user_id)
+            deliveries.close()
+
+        # Recipients whose delivery raised are marked as failed, so they aren't fetched again
+        if failed := {user_id: RecipientStatus.FAILED for user_id in user_ids if user_id not in results}:
+            await BroadcastClient.run(BroadcastClient.save_results, broadcast.id, failed)
+            results.update(failed)
+
+        return results
+
+    @classmethod
+    async def send_copy(cls, bot: Bot, user_id: int, message_id: int) -> RecipientStatus:
+        try:
+            await bot.copy_message(
+                chat_id=user_id,
+                from_chat_id=cls._admin_id(),
+                message_id=message_id,
+                disable_notification=True,
+            )
+        except TelegramRetryAfter:
+            raise
+        except (TelegramForbiddenError, TelegramNotFound):
+            return RecipientStatus.BLOCKED
+        except TelegramMigrateToChat as e:
+            logger.info("Migrate user-id %s to %s", user_id, e.migrate_to_chat_id)
+            user = await UserClient.run(UserClient.fetch, user_id)
+            await UserClient.run(update_user_id, user, e.migrate_to_chat_id)
+        except TelegramAPIError:
+            logger.exception("Failed to send broadcast-message")
+        else:
+            return RecipientStatus.SENT
+
+        return RecipientStatus.FAILED
+
+    @classmethod
+    async def report_progress(cls, bot: Bot, broadcast: BroadcastModel, stats: DeliveryStats) -> None:
+        if broadcast.progress_message_id is None:
+            return
+
+        text = Messages.broadcast_progress(
+            await BroadcastClient.run(BroadcastClient.count_recipients, broadcast.id),
+            stats.throughput,
+            finished=broadcast.finished_at is not None,
+        )
+        try:
+            await bot.edit_message_text(text=text, chat_id=cls._admin_id(), message_id=broadcast.progress_message_id)
+        except TelegramAPIError:
+            logger.debug("Could not update progress of broadcast %s", broadcast.id, exc_info=True)
+
+    @staticmethod
+    def _admin_id() -> int:
+        if not config.OWN_ID:
+            msg = "Can't send broadcast without own ID in config"
+            raise NotImplementedError(msg)
+
+        return config.OWN_ID
@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from asyncio import Queue, QueueShutDown
+from collections import deque
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Generic, TypeVar
+
+from aiogram.exceptions import TelegramRetryAfter
+
+from src import config
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable
+
+ItemT = TypeVar("ItemT")
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Allows `rate` requests per second with bursts of up to `capacity` requests, and can be paused."""
+
+    def __init__(self, rate: float, capacity: float, clock: Callable[[], float] = time.monotonic):
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+        self._paused_until = 0.0
+
+    def delay(self) -> float:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+        return max(self._paused_until - now, (1 - self._tokens) / self.rate, 0)
+
+    def take(self) -> None:
+        self._tokens -= 1
+
+    def pause(self, seconds: float) -> None:
+        self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+    @property
+    def idle(self) -> bool:
+        return self.delay() == 0 and self._tokens >= self.capacity
+
+
+class RateLimiter:
+    """Token buckets for Telegram's global limit and the limit of every chat."""
+
+    def __init__(self) -> None:
+        self.global_bucket = TokenBucket(config.TELEGRAM_GLOBAL_RATE, config.TELEGRAM_GLOBAL_RATE)
+        self._chat_buckets: dict[int, TokenBucket] = {}
+
+    def chat_bucket(self, chat_id: int) -> TokenBucket:
+        if chat_id not in self._chat_buckets:
+            if len(self._chat_buckets) >= config.TELEGRAM_CHAT_BUCKETS:
+                self._chat_buckets = {chat: bucket for chat, bucket in self._chat_buckets.items() if not bucket.idle}
+
+            rate = config.TELEGRAM_GROUP_RATE if chat_id < 0 else config.TELEGRAM_CHAT_RATE
+            self._chat_buckets[chat_id] = TokenBucket(rate, 1)
+
+        return self._chat_buckets[chat_id]
+
+    def retry_after(self, chat_id: int, seconds: float) -> None:
+        if self.global_bucket.delay() > 0:
+            logger.warning("Flood control hit at the global limit, pause all chats for %s seconds", seconds)
+            self.global_bucket.pause(seconds)
+
+        self.chat_bucket(chat_id).pause(seconds)
+
+
+class NotificationCap:
+    """Counts the deal messages of every user in a sliding window, to cap them at NOTIFICATION_CAP per window."""
+
+    def __init__(self, cap: int, window: float, clock: Callable[[], float] = time.monotonic):
+        self.cap = cap
+        self.window = window
+        self._clock = clock
+        self._sent: dict[int, deque[float]] = {}
+
+    def remaining(self, user_id: int) -> int:
+        sent = self._sent.get(user_id)
+        if sent is None:
+            return self.cap
+
+        expired = self._clock() - self.window
+        while sent and sent[0] <= expired:
+            sent.popleft()
+        if not sent:
+            del self._sent[user_id]
+
+        return max(self.cap - len(sent), 0)
+
+    def record(self, user_id: int) -> None:
+        self._sent.setdefault(user_id, deque()).append(self._clock())
+
+
+@dataclass
+class DeliveryStats:
+    sent: int = 0
+    failed: int = 0
+    retries: int = 0
+    latency: float = 0.0
+    max_latency: float = 0.0
+    started: float = field(default_factory=time.monotonic)
+
+    def add(self, latency: float) -> None:
+        self.sent += 1
+        self.latency += latency
+        self.max_latency = max(self.max_latency, latency)
+
+    @property
+    def throughput(self) -> float:
+        return self.sent / max(time.monotonic() - self.started, 1e-9)
+
+    def __str__(self) -> str:
+        average_latency = self.latency / self.sent if self.sent else 0
+        return (
+            f"{self.sent} sent ({self.throughput:.1f}/s), {self.failed} failed, {self.retries} retried, "
+            f"queue latency avg {average_latency * 1000:.0f} ms, max {self.max_latency * 1000:.0f} ms"
+        )
+
+
+class DeliveryQueue(Generic[ItemT]):
+    """Sends queued items with a pool of workers, within the limits of a RateLimiter."""
+
+    def __init__(
+        self,
+        send: Callable[[ItemT], Awaitable[object]],
+        rate_limiter: RateLimiter,
+        max_size: int,
+        stats: DeliveryStats | None = None,
+    ):
+        self._send = send
+        self._rate_limiter = rate_limiter
+        self._slots = asyncio.Semaphore(max_size)
+        self._chats: dict[int, deque[tuple[ItemT, float]]] = {}
+        self._ready: Queue[int] = Queue()
+        self._pending = 0
+        self._closed = False
+        self.stats = stats or DeliveryStats()
+
+    def __len__(self) -> int:
+        return self._pending
+
+    async def put(self, chat_id: int, item: ItemT) -> None:
+        await self._slots.acquire()
+        self._pending += 1
+
+        if chat_id in self._chats:
+            self._chats[chat_id].append((item, time.monotonic()))
+        else:
+            self._chats[chat_id] = deque([(item, time.monotonic())])
+            self._ready.put_nowait(chat_id)
+
+    def close(self) -> None:
+        self._closed = True
+        self._shutdown_when_done()
+
+    async def run(self, workers: int) -> None:
+        async with asyncio.TaskGroup() as tasks:
+            for _ in range(workers):
+                tasks.create_task(self._work())
+
+    async def _work(self) -> None:
+        while True:
+            try:
+                chat_id = await self._ready.get()
+            except QueueShutDown:
+                return
+
+            chat_bucket = self._rate_limiter.chat_bucket(chat_id)
+            if (delay := max(chat_bucket.delay(), self._rate_limiter.global_bucket.delay())) > 0:
+                self._reschedule(chat_id, delay)
+                continue
+
+            self._rate_limiter.global_bucket.take()
+            chat_bucket.take()
+
+            item, queued_at = self._chats[chat_id][0]
+            try:
+                await self._send(item)
+            except TelegramRetryAfter as e:
+                self.stats.retries += 1
+                self._rate_limiter.retry_after(chat_id, e.retry_after)
+                self._reschedule(chat_id, e.retry_after)
+                continue
+            except Exception:
+                self.stats.failed += 1
+                logger.exception("Delivery to chat %s failed", chat_id)
+            else:
+                self.stats.add(time.monotonic() - queued_at)
+
+            self._done(chat_id)
+
+    def _reschedule(self, chat_id: int, delay: float) -> None:
+        asyncio.get_running_loop().call_later(delay, self._ready.put_nowait, chat_id)
+
+    def _done(self, chat_id: int) -> None:
+        self._chats[chat_id].popleft()
+        self._pending -= 1
+        self._slots.release()
+
+        if self._chats[chat_id]:
+            self._ready.put_nowait(chat_id)
+        else:
+            del self._chats[chat_id]
+            self._shutdown_when_done()
+
+    def _shutdown_when_done(self) -> None:
+        if self._closed and not self._pending:
+            self._ready.shutdown()
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import OrderedDict
+from typing import ClassVar
+
+from src import config
+
+UNUSABLE = ""
+
+
+class ImageCache:
+    """LRU cache of the Telegram file-ids of deal images, keyed by the image url."""
+
+    _cache: ClassVar[OrderedDict[str, tuple[str, float]]] = OrderedDict()
+    _uploads: ClassVar[dict[str, asyncio.Event]] = {}
+    _hits = 0
+    _uploaded = 0
+
+    @classmethod
+    async def acquire(cls, url: str) -> str | None:
+        while (upload := cls._uploads.get(url)) is not None:
+            await upload.wait()
+
+        file_id = cls._get(url)
+        if file_id is not None:
+            cls._hits += 1
+
+            return file_id or None
+
+        cls._uploads[url] = asyncio.Event()
+
+        return url
+
+    @classmethod
+    def release(cls, url: str, file_id: str | None = None) -> None:
+        if file_id is not None:
+            cls._put(url, file_id)
+            cls._uploaded += 1
+
+        if (upload := cls._uploads.pop(url, None)) is not None:
+            upload.set()
+
+    @classmethod
+    def mark_unusable(cls, url: str) -> None:
+        cls._put(url, UNUSABLE)
+
+    @classmethod
+    def _get(cls, url: str) -> str | None:
+        cached = cls._cache.get(url)
+        if cached is None:
+            return None
+
+        file_id, stored_at = cached
+        if stored_at < time.time() - config.IMAGE_CACHE_TTL:
+            del cls._cache[url]
+
+            return None
+
+        cls._cache.move_to_end(url)
+
+        return file_id
+
+    @classmethod
+    def _put(cls, url: str, file_id: str) -> None:
+        cls._cache[url] = (file_id, time.time())
+        cls._cache.move_to_end(url)
+        while len(cls._cache) > config.IMAGE_CACHE_SIZE:
+            cls._cache.popitem(last=False)
+
+    @classmethod
+    def stats(cls) -> str:
+        return f"{len(cls._cache)} images cached, {cls._uploaded} uploaded, {cls._hits} sent by file-id"
+
+    @classmethod
+    def clear(cls) -> None:
+        cls._cache.clear()
+        cls._uploads.clear()
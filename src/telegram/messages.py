@@ -4,11 +4,16 @@ import html
 import textwrap
 from typing import TYPE_CHECKING
 
+from src.models import RecipientStatus
 from src.telegram.enums import BotCommand
 
 if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+
     from src.models import DealModel, NotificationModel, UserModel
 
+MAX_MESSAGE_LENGTH = 4096
+
 
 class Messages:
     @staticmethod
@@ -136,6 +141,22 @@ class Messages:
 
         return f"{message}{Messages.create_ref_link(deal.full_title)}"
 
+    @staticmethod
+    def deal_digest(deals: Sequence[tuple[DealModel, NotificationModel]]) -> list[str]:
+        # Long digests are split into several messages, so every deal is listed
+        messages = [f"{len(deals)} weitere neue Deals:"]
+        for deal, notification in deals:
+            line = f'• <a href="{deal.link}">{html.escape(deal.full_title)}</a> ({notification.search_query})'
+            if deal.price.amount:
+                line += f" <b>{deal.price.amount:.2f} {deal.price.currency}</b>"
+
+            if len(messages[-1]) + len(line) + 1 > MAX_MESSAGE_LENGTH:
+                messages.append(line)
+            else:
+                messages[-1] += f"\n{line}"
+
+        return messages
+
     @staticmethod
     def create_ref_link(deal_title: str) -> str:
         if "topcashback" in deal_title.lower():
@@ -195,5 +216,17 @@ class Messages:
         return "Möchtest Du diese Nachricht an alle Nutzer senden?"
 
     @staticmethod
-    def broadcast_sent(amount_successful: int, amount_total: int) -> str:
-        return f"Erfolgreich an {amount_successful}/{amount_total} Nutzer geschickt."
+    def broadcast_progress(
+        counts: Mapping[RecipientStatus, int], throughput: float = 0, *, finished: bool = False
+    ) -> str:
+        total = sum(counts.values())
+        message = "Broadcast abgeschlossen." if finished else "Broadcast läuft …"
+
+        return (
+            f"{message}\n\n"
+            f"Gesendet: {counts[RecipientStatus.SENT]}/{total}\n"
+            f"Fehlgeschlagen: {counts[RecipientStatus.FAILED]}\n"
+            f"Bot blockiert: {counts[RecipientStatus.BLOCKED]}\n"
+            f"Ausstehend: {counts[RecipientStatus.PENDING]}\n"
+            f"Durchsatz: {throughput:.1f} Nachrichten/s"
+        )
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from asyncio import CancelledError, Task
+from contextlib import suppress
+from typing import TYPE_CHECKING
+
+from aiogram.exceptions import TelegramRetryAfter
+
+from src import config
+from src.db.outbox_client import OutboxClient
+from src.db.subscription_registry import SubscriptionRegistry
+from src.models import DealModel, NotificationModel, OutboxModel, UserModel
+from src.telegram.delivery import DeliveryQueue, DeliveryStats, NotificationCap
+from src.telegram.image_cache import ImageCache
+
+if TYPE_CHECKING:
+    from src.telegram.bot import TelegramBot
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxSender:
+    """Sends the deliveries that matching wrote to the outbox table."""
+
+    def __init__(self, bot: TelegramBot):
+        self.bot = bot
+        self.rate_limiter = bot.rate_limiter
+        self.notification_cap = NotificationCap(config.NOTIFICATION_CAP, config.NOTIFICATION_WINDOW)
+        self.wakeup = asyncio.Event()
+        self._task: Task[None] | None = None
+
+    @classmethod
+    def entry(cls, deal: DealModel, notification: NotificationModel, user: UserModel) -> OutboxModel:
+        return OutboxModel(
+            key=f"{deal.key}:{user.id}:{notification.id}",
+            notification_id=notification.id,
+            user_id=user.id,
+            deal=deal.model_dump_json(),
+            created_at=time.time(),
+        )
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self.run(), name="outbox-sender")
+
+    async def exit(self) -> None:
+        # Entries that are being sent stay in the outbox and are sent after the next start
+        if self._task is not None:
+            self._task.cancel()
+            with suppress(CancelledError):
+                await self._task
+            self._task = None
+
+    def wake(self) -> None:
+        self.wakeup.set()
+
+    async def run(self) -> None:
+        while True:
+            self.wakeup.clear()
+            try:
+                await self.drain()
+            except Exception:
+                logger.exception("Error while sending the outbox")
+
+            with suppress(TimeoutError):
+                await asyncio.wait_for(self.wakeup.wait(), config.PARSE_INTERVAL)
+
+    async def drain(self) -> DeliveryStats:
+        stats = DeliveryStats()
+        while entries := await OutboxClient.run(
+            OutboxClient.fetch_pending, config.OUTBOX_BATCH_SIZE, config.OUTBOX_MAX_ATTEMPTS, time.time()
+        ):
+            deliveries: DeliveryQueue[list[OutboxModel]] = DeliveryQueue(
+                self.send_entries, self.rate_limiter, len(entries), stats
+            )
+            async with asyncio.TaskGroup() as tasks:
+                tasks.create_task(deliveries.run(config.PIPELINE_SENDERS))
+                await self.queue_entries(deliveries, entries)
+                deliveries.close()
+
+        await OutboxClient.run(OutboxClient.purge, time.time() - config.OUTBOX_RETENTION, config.OUTBOX_MAX_ATTEMPTS)
+        if stats.sent or stats.failed:
+            logger.info("Outbox: %s", stats)
+            logger.info("Image cache: %s", ImageCache.stats())
+
+        return stats
+
+    async def queue_entries(self, deliveries: DeliveryQueue[list[OutboxModel]], entries: list[OutboxModel]) -> None:
+        entries_by_user: dict[int, list[OutboxModel]] = {}
+        for entry in entries:
+            entries_by_user.setdefault(entry.user_id, []).append(entry)
+
+        for user_id, user_entries in entries_by_user.items():
+            remaining = self.notification_cap.remaining(user_id)
+            for entry in user_entries[:remaining]:
+                await deliveries.put(user_id, [entry])
+
+            if digest := user_entries[remaining:]:
+                await deliveries.put(user_id, digest)
+
+    async def send_entries(self, entries: list[OutboxModel]) -> None:
+        deals = [
+            (DealModel.model_validate_json(entry.deal), *subscription)
+            for entry in entries
+            if (subscription := SubscriptionRegistry.subscription(entry.notification_id)) is not None
+        ]
+        entry_ids = [entry.id for entry in entries]
+
+        try:
+            if len(deals) == 1:
+                await self.bot.send_deal(*deals[0])
+                self.notification_cap.record(deals[0][2].id)
+            elif deals:
+                await self.bot.send_digest(deals[0][2], [(deal, notification) for deal, notification, _ in deals])
+        except TelegramRetryAfter:
+            raise
+        except Exception:
+            await OutboxClient.run(OutboxClient.mark_failed, entry_ids, time.time(), config.OUTBOX_RETRY_DELAY)
+            raise
+
+        await OutboxClient.run(OutboxClient.mark_sent, entry_ids, time.time())
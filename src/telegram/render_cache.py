@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import TYPE_CHECKING, ClassVar
+
+from src import config
+from src.telegram.keyboards import Keyboards
+from src.telegram.messages import Messages
+
+if TYPE_CHECKING:
+    from aiogram.types import InlineKeyboardMarkup
+
+    from src.models import DealModel, NotificationModel
+
+DealSignature = tuple[str, str, str, float, str]
+
+
+class RenderCache:
+    """LRU caches of rendered deal messages and keyboards, so a deal sent to many users is rendered only once."""
+
+    _messages: ClassVar[OrderedDict[tuple[str, str], tuple[DealSignature, str]]] = OrderedDict()
+    _keyboards: ClassVar[OrderedDict[tuple[str, int], InlineKeyboardMarkup]] = OrderedDict()
+    _max_size: int = config.RENDER_CACHE_SIZE
+
+    @classmethod
+    def deal_msg(cls, deal: DealModel, notification: NotificationModel) -> str:
+        key = (deal.key, notification.search_query)
+        signature = (deal.link, deal.full_title, deal.description, deal.price.amount, deal.price.currency)
+        cached = cls._messages.get(key)
+        if cached and cached[0] == signature:
+            cls._messages.move_to_end(key)
+
+            return cached[1]
+
+        message = Messages.deal_msg(deal, notification)
+        cls._messages[key] = (signature, message)
+        cls._messages.move_to_end(key)
+        while len(cls._messages) > cls._max_size:
+            cls._messages.popitem(last=False)
+
+        return message
+
+    @classmethod
+    def deal_kb(cls, deal: DealModel, notification: NotificationModel) -> InlineKeyboardMarkup:
+        key = (deal.link, notification.id)
+        keyboard = cls._keyboards.get(key)
+        if keyboard is not None:
+            cls._keyboards.move_to_end(key)
+
+            return keyboard
+
+        keyboard = cls._keyboards[key] = Keyboards.deal_kb(deal.link, notification)
+        while len(cls._keyboards) > cls._max_size:
+            cls._keyboards.popitem(last=False)
+
+        return keyboard
+
+    @classmethod
+    def clear(cls) -> None:
+        cls._messages.clear()
+        cls._keyboards.clear()
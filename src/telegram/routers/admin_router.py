@@ -4,17 +4,10 @@ import logging
 from typing import TYPE_CHECKING
 
 from aiogram import Bot, Router
-from aiogram.exceptions import (
-    TelegramAPIError,
-    TelegramForbiddenError,
-    TelegramMigrateToChat,
-    TelegramNotFound,
-)
 from aiogram.filters import Command
 
 from src import config
-from src.db.db_utilities import update_user_id
-from src.db.user_client import UserClient
+from src.telegram.broadcaster import Broadcaster
 from src.telegram.callbacks import BroadcastCB
 from src.telegram.enums import BotCommand
 from src.telegram.keyboards import Keyboards
@@ -26,6 +19,8 @@ if TYPE_CHECKING:
     from aiogram.fsm.context import FSMContext
     from aiogram.types import CallbackQuery, Message
 
+    from src.telegram.delivery import RateLimiter
+
 admin_router = Router()
 
 logger = logging.getLogger(__name__)
@@ -52,48 +47,9 @@ async def broadcast_validate(telegram_object: Message, state: FSMContext) -> Non
 
 @admin_router.callback_query(BroadcastCB.filter())
 async def broadcast_send(
-    telegram_object: CallbackQuery, callback_data: BroadcastCB, state: FSMContext, bot: Bot
+    telegram_object: CallbackQuery, callback_data: BroadcastCB, state: FSMContext, bot: Bot, rate_limiter: RateLimiter
 ) -> None:
     await state.clear()
-    message_id = callback_data.message_id
-
-    user_ids = UserClient.fetch_all_ids()
-
-    sent_to = 0
-    for user_id in user_ids:
-        try:
-            if await send_copy(bot, user_id, message_id):
-                sent_to += 1
-        except TelegramAPIError:  # noqa: PERF203
-            logger.exception("Sending broadcast message failed")
-
-    await overwrite_or_answer(
-        telegram_object,
-        Messages.broadcast_sent(sent_to, len(user_ids)),
-    )
-
-
-async def send_copy(bot: Bot, user_id: int, message_id: int) -> bool:
-    if not config.OWN_ID:
-        msg = "Can't send broadcast without own ID in config"
-        raise NotImplementedError(msg)
-
-    try:
-        await bot.copy_message(
-            chat_id=user_id,
-            from_chat_id=config.OWN_ID,
-            message_id=message_id,
-            disable_notification=True,
-        )
-    except (TelegramForbiddenError, TelegramNotFound):
-        logger.info("User %s blocked the bot. Disable him", user_id)
-        UserClient.disable(user_id)
-    except TelegramMigrateToChat as e:
-        logger.info("Migrate user-id %s to %s", user_id, e.migrate_to_chat_id)
-        update_user_id(UserClient.fetch(user_id), e.migrate_to_chat_id)
-    except TelegramAPIError:
-        logger.exception("Failed to send broadcast-message")
-    else:
-        return True
-
-    return False
+    # The confirmation shows the progress of the broadcast
+    progress_message_id = telegram_object.message.message_id if telegram_object.message else None
+    await Broadcaster.start(bot, rate_limiter, callback_data.message_id, progress_message_id)
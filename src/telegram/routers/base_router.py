@@ -28,13 +28,13 @@ base_router: Router = Router()
 
 @base_router.message(F.from_user.func(lambda from_user: config.WHITELIST and from_user.id not in config.WHITELIST))
 async def not_whitelisted(message: Message, event_chat: Chat) -> None:
-    UserClient().disable(event_chat.id)
+    await UserClient.run(UserClient.disable, event_chat.id)
     await message.answer(Messages.user_not_whitelisted())
 
 
 @base_router.message(F.from_user.func(lambda from_user: config.BLACKLIST and from_user.id in config.BLACKLIST))
 async def blacklisted(message: Message, event_chat: Chat) -> None:
-    UserClient().disable(event_chat.id)
+    await UserClient.run(UserClient.disable, event_chat.id)
     await message.answer(Messages.user_blacklisted())
 
 
@@ -47,10 +47,9 @@ async def start(
     callback_data: HomeCB | None = None,
 ) -> None:
     await state.clear()
-    user_client = UserClient()
 
     try:
-        user = user_client.fetch(event_chat.id)
+        user = await UserClient.run(UserClient.fetch, event_chat.id)
     except UserNotFoundError:
         user = UserModel(
             id=event_chat.id,
@@ -59,12 +58,12 @@ async def start(
             last_name=event_chat.last_name,
         )
         logger.info("New user: %s", user)
-        user_client.add(user)
+        await UserClient.run(UserClient.add, user)
 
     if not user.active:
-        user_client.enable(user.id)
+        await UserClient.run(UserClient.enable, user.id)
 
-    notifications = NotificationClient().fetch_by_user_id(user.id)
+    notifications = await NotificationClient.run(NotificationClient.fetch_by_user_id, user.id)
 
     page = callback_data.page if callback_data else 0
 
@@ -89,7 +88,7 @@ async def get_help(telegram_object: Message | CallbackQuery) -> None:
 async def cancel(message: Message, event_chat: Chat, state: FSMContext) -> None:
     try:
         notification_id = await get_id(state)
-        notification = NotificationClient().fetch(notification_id)
+        notification = await NotificationClient.run(NotificationClient.fetch, notification_id)
     except (KeyError, NotificationNotFoundError):
         await start(telegram_object=message, event_chat=event_chat, state=state)
     else:
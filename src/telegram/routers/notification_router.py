@@ -65,7 +65,7 @@ async def add_notification(
         return
 
     notification = NotificationModel(search_query=prettify_query(query), user_id=event_chat.id)
-    notification = NotificationClient().add(notification)
+    notification = await NotificationClient.run(NotificationClient.add, notification)
 
     await overwrite_or_answer(
         telegram_object,
@@ -76,7 +76,7 @@ async def add_notification(
 
 @notification_router.callback_query(ViewNotificationCB.filter())
 async def show_notification(callback_query: CallbackQuery, callback_data: ViewNotificationCB) -> None:
-    notification = NotificationClient().fetch(callback_data.id)
+    notification = await NotificationClient.run(NotificationClient.fetch, callback_data.id)
 
     await overwrite_or_answer(
         callback_query,
@@ -104,7 +104,8 @@ async def process_update_query(message: Message, state: FSMContext) -> None:
         logger.error("Empty message text in process update should not be possible")
         return
 
-    notification = NotificationClient().update_query(
+    notification = await NotificationClient.run(
+        NotificationClient.update_query,
         await get_id(state),
         prettify_query(message.text),
     )
@@ -131,7 +132,9 @@ async def edit_min_price(
 @notification_router.message(States.UPDATE_MIN_PRICE, F.text.regexp(PRICE_PATTERN))
 @notification_router.message(States.UPDATE_MIN_PRICE, Command(BotCommand.REMOVE))
 async def process_edit_min_price(message: Message, state: FSMContext) -> None:
-    notification = NotificationClient().update_min_price(await get_id(state), __message_to_price(message.text))
+    notification = await NotificationClient.run(
+        NotificationClient.update_min_price, await get_id(state), __message_to_price(message.text)
+    )
 
     await state.clear()
     await overwrite_or_answer(
@@ -155,7 +158,9 @@ async def edit_max_price(
 @notification_router.message(States.UPDATE_MAX_PRICE, F.text.regexp(PRICE_PATTERN))
 @notification_router.message(States.UPDATE_MAX_PRICE, Command(BotCommand.REMOVE))
 async def process_edit_max_price(message: Message, state: FSMContext) -> None:
-    notification = NotificationClient().update_max_price(await get_id(state), __message_to_price(message.text))
+    notification = await NotificationClient.run(
+        NotificationClient.update_max_price, await get_id(state), __message_to_price(message.text)
+    )
 
     await state.clear()
     await overwrite_or_answer(
@@ -170,7 +175,7 @@ async def toggle_only_hot(
     callback_query: CallbackQuery,
     callback_data: ToggleHotOnlyCB,
 ) -> None:
-    notification = NotificationClient().toggle_search_hot_only(callback_data.id)
+    notification = await NotificationClient.run(NotificationClient.toggle_search_hot_only, callback_data.id)
 
     await overwrite_or_answer(
         callback_query,
@@ -184,7 +189,7 @@ async def toggle_search_description(
     callback_query: CallbackQuery,
     callback_data: ToggleSearchDescriptionCB,
 ) -> None:
-    notification = NotificationClient().toggle_search_description(callback_data.id)
+    notification = await NotificationClient.run(NotificationClient.toggle_search_description, callback_data.id)
 
     await overwrite_or_answer(
         callback_query,
@@ -195,7 +200,7 @@ async def toggle_search_description(
 
 @notification_router.callback_query(DeleteNotificationCB.filter())
 async def delete_notification(callback_query: CallbackQuery, callback_data: DeleteNotificationCB) -> None:
-    notification = NotificationClient().delete(callback_data.id)
+    notification = await NotificationClient.run(NotificationClient.delete, callback_data.id)
 
     await overwrite_or_answer(
         telegram_object=callback_query,
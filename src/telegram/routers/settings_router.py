@@ -27,7 +27,7 @@ async def settings(
 ) -> None:
     await state.clear()
 
-    user = UserClient().fetch(event_chat.id)
+    user = await UserClient.run(UserClient.fetch, event_chat.id)
     await overwrite_or_answer(
         telegram_object,
         "Einstellungen:",
@@ -41,7 +41,7 @@ async def toggle_search_mydealz(
     event_chat: Chat,
     state: FSMContext,
 ) -> None:
-    UserClient().toggle_search_mydealz(event_chat.id)
+    await UserClient.run(UserClient.toggle_search_mydealz, event_chat.id)
 
     await settings(callback_query, event_chat, state)
 
@@ -52,7 +52,7 @@ async def toggle_search_preisjaeger(
     event_chat: Chat,
     state: FSMContext,
 ) -> None:
-    UserClient().toggle_search_preisjaeger(event_chat.id)
+    await UserClient.run(UserClient.toggle_search_preisjaeger, event_chat.id)
 
     await settings(callback_query, event_chat, state)
 
@@ -63,6 +63,6 @@ async def toggle_send_images(
     event_chat: Chat,
     state: FSMContext,
 ) -> None:
-    UserClient().toggle_send_images(event_chat.id)
+    await UserClient.run(UserClient.toggle_send_images, event_chat.id)
 
     await settings(callback_query, event_chat, state)
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiohttp import TraceConfig
+
+from src import config
+
+if TYPE_CHECKING:
+    from aiohttp import ClientSession
+
+
+class TelegramSession(AiohttpSession):
+    """Bot session with a connection pool for the bot's send concurrency, counting new and reused connections."""
+
+    def __init__(self, limit: int):
+        super().__init__(limit=limit)
+        # Keep idle connections open between two feed runs instead of aiohttp's default of 15 seconds
+        self._connector_init["keepalive_timeout"] = config.HTTP_KEEPALIVE_TIMEOUT
+        self.new_connections = 0
+        self.reused_connections = 0
+
+        self._trace_config = TraceConfig()
+        self._trace_config.on_connection_create_end.append(self._on_connection_create)
+        self._trace_config.on_connection_reuseconn.append(self._on_connection_reuse)
+        self._trace_config.freeze()
+
+    async def create_session(self) -> ClientSession:
+        session = await super().create_session()
+        if self._trace_config not in session.trace_configs:
+            session.trace_configs.append(self._trace_config)
+
+        return session
+
+    async def _on_connection_create(self, *_: object) -> None:
+        self.new_connections += 1
+
+    async def _on_connection_reuse(self, *_: object) -> None:
+        self.reused_connections += 1
+
+    def __str__(self) -> str:
+        requests = self.new_connections + self.reused_connections
+        return f"{self.reused_connections}/{requests} requests reused a connection, {self.new_connections} opened"
@@ -1,11 +1,24 @@
 from datetime import datetime
+from pathlib import Path
 
 import pytest
 from pytz import timezone
+from sqlalchemy import StaticPool, create_engine
 
+from src import config
+from src.db.db_client import DbClient
 from src.models import DealModel, PriceModel
 
 
+@pytest.fixture
+def database(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    # One shared connection, so the database thread sees the same in-memory database
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    monkeypatch.setattr(DbClient, "_engine", engine)
+    monkeypatch.setattr(config, "FILE_DIR", tmp_path)
+    DbClient.init_db()
+
+
 @pytest.fixture
 def deal0() -> DealModel:
     return DealModel(
@@ -0,0 +1,22 @@
+import asyncio
+import threading
+from pathlib import Path
+
+from sqlalchemy import text
+
+from src.db.db_client import DbClient, create_db_engine
+
+
+def test_pragmas(tmp_path: Path) -> None:
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'test.db'}")
+
+    with engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert connection.execute(text("PRAGMA synchronous")).scalar() == 1
+
+
+def test_run_in_database_thread() -> None:
+    thread_name = asyncio.run(DbClient.run(lambda: threading.current_thread().name))
+
+    assert thread_name.startswith("db")
+    assert thread_name != threading.current_thread().name
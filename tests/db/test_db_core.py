@@ -91,11 +91,21 @@ class TestDbCore:
         assert updated_user == fetched_user
         assert len(notifications) > 0
         assert isinstance(notifications[0], NotificationModel)
+        with pytest.raises(UserNotFoundError):
+            assert UserClient.fetch(user1.id)
 
     @classmethod
-    def test_change_user_to_existing_id(cls, user1: UserModel, user3: UserModel) -> None:
-        updated_user = update_user_id(user1, user3.id)
+    def test_change_user_to_existing_id(cls, user3: UserModel) -> None:
+        user = UserClient.fetch(30)
+        updated_user = update_user_id(user, user3.id)
 
         assert updated_user == user3
         with pytest.raises(UserNotFoundError):
-            assert UserClient.fetch(user1.id)
+            assert UserClient.fetch(user.id)
+
+    @classmethod
+    def test_update_missing(cls) -> None:
+        with pytest.raises(UserNotFoundError):
+            UserClient.toggle_send_images(12345)
+        with pytest.raises(NotificationNotFoundError):
+            NotificationClient.toggle_search_hot_only(12345)
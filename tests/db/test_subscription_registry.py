@@ -0,0 +1,68 @@
+from sqlmodel import Session
+
+from src.db.db_client import DbClient
+from src.db.notification_client import NotificationClient
+from src.db.subscription_registry import SubscriptionRegistry
+from src.db.user_client import UserClient
+from src.models import NotificationModel, UserModel
+
+
+def subscription_ids() -> list[tuple[int, int]]:
+    return [(notification.id, user.id) for notification, user in SubscriptionRegistry.subscriptions()]
+
+
+class TestSubscriptionRegistry:
+    @classmethod
+    def test_load(
+        cls,
+        db_client: DbClient,
+        users: tuple[UserModel, ...],
+        all_notifications: tuple[NotificationModel, ...],
+    ) -> None:
+        db_client.init_db()
+        for user in users:
+            UserClient.add(user)
+        for notification in all_notifications:
+            NotificationClient.add(notification)
+
+        assert not SubscriptionRegistry.is_loaded()
+        SubscriptionRegistry.load()
+
+        assert subscription_ids() == [(n.id, u.id) for n, u in NotificationClient.fetch_all_active()]
+
+    @classmethod
+    def test_incremental_updates(cls, user0: UserModel, notification0: NotificationModel) -> None:
+        version = SubscriptionRegistry.version()
+
+        NotificationClient.update_query(notification0.id, "new query")
+        NotificationClient.toggle_search_hot_only(notification0.id)
+        notification = SubscriptionRegistry.subscriptions()[0][0]
+        assert notification.search_query == "new query"
+        assert notification.search_hot_only is True
+
+        UserClient.disable(user0.id)
+        assert user0.id not in [user.id for _, user in SubscriptionRegistry.subscriptions()]
+        UserClient.enable(user0.id)
+
+        NotificationClient.delete(notification0.id)
+        assert notification0.id not in [n.id for n, _ in SubscriptionRegistry.subscriptions()]
+
+        new_notification = NotificationClient.add(NotificationModel(search_query="added", user_id=user0.id))
+        assert new_notification.id in [n.id for n, _ in SubscriptionRegistry.subscriptions()]
+
+        assert SubscriptionRegistry.version() > version
+        assert SubscriptionRegistry.check_consistency()
+
+    @classmethod
+    def test_consistency_check(cls, session: Session, notification1: NotificationModel) -> None:
+        notification = session.get(NotificationModel, notification1.id)
+        assert notification
+        notification.search_query = "changed behind the registry"
+        session.add(notification)
+        session.commit()
+
+        assert not SubscriptionRegistry.check_consistency()
+        assert "changed behind the registry" in [n.search_query for n, _ in SubscriptionRegistry.subscriptions()]
+        assert SubscriptionRegistry.check_consistency()
+
+        SubscriptionRegistry.unload()
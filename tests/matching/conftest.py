@@ -0,0 +1,62 @@
+import pytest
+
+from src.models import DealModel, NotificationModel, UserModel
+
+QUERIES = [
+    "funko & pop & star & wars, funko & pop & one & piece",
+    "funko & pop & !lokal",
+    r"r/1\d{2} ?PS",
+    r"r/1\d{2} ?PS/i",
+    "skoda+octavia & !automatik",
+    "skoda+octavia",
+    "2für1, 2+für+1",
+    "[bauhaus]",
+    "bio-dinkelbrot",
+    "kein & match",
+    "pentax+",
+    "neu+",
+    "!lokal",
+    "staubsauger",
+    "akku & bosch",
+    "amazon",
+    "müller",
+    "e",
+]
+
+
+@pytest.fixture
+def subscriptions() -> list[tuple[NotificationModel, UserModel]]:
+    users = [
+        UserModel(id=1, search_mydealz=True, search_preisjaeger=True),
+        UserModel(id=2, search_mydealz=True, search_preisjaeger=False),
+        UserModel(id=3, search_mydealz=False, search_preisjaeger=True),
+    ]
+    prices = [(None, None), (10, None), (None, 30), (5, 200), (0, 0)]
+
+    subscriptions = []
+    for i, query in enumerate(QUERIES * 2):
+        min_price, max_price = prices[i % len(prices)]
+        notification = NotificationModel(
+            id=i + 1,
+            search_query=query,
+            min_price=min_price,
+            max_price=max_price,
+            search_hot_only=i % 4 == 0,
+            search_description=i % 3 == 0,
+            user_id=users[i % len(users)].id,
+        )
+        subscriptions.append((notification, users[i % len(users)]))
+
+    return subscriptions
+
+
+@pytest.fixture
+def deals(
+    deal0: DealModel,
+    deal1: DealModel,
+    deal2: DealModel,
+    deal3: DealModel,
+    deal4: DealModel,
+    deal5: DealModel,
+) -> list[DealModel]:
+    return [deal0, deal1, deal2, deal3, deal4, deal5]
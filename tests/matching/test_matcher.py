@@ -0,0 +1,38 @@
+import pytest
+
+from src.matching.bitset_matcher import BitsetMatcher
+from src.matching.matcher import IndexMatcher, Matcher
+from src.models import DealModel, NotificationModel, UserModel
+from src.rss.feedparser import FeedParser
+
+
+@pytest.mark.parametrize("matcher_class", [IndexMatcher, BitsetMatcher])
+def test_matcher_matches_like_brute_force(
+    matcher_class: type[Matcher],
+    subscriptions: list[tuple[NotificationModel, UserModel]],
+    deals: list[DealModel],
+) -> None:
+    matcher = matcher_class(subscriptions, FeedParser.notification_matches_deal)
+
+    expected = [[s for s in subscriptions if FeedParser.notification_matches_deal(s[0], deal)] for deal in deals]
+    assert matcher.match_deals(deals) == expected
+    assert matcher.matches(deals[0]) == expected[0]
+    assert matcher.match_deals([]) == []
+
+
+@pytest.mark.parametrize("matcher_class", [IndexMatcher, BitsetMatcher])
+def test_matcher_groups_identical_queries(
+    matcher_class: type[Matcher],
+    subscriptions: list[tuple[NotificationModel, UserModel]],
+    deal0: DealModel,
+) -> None:
+    duplicates = [
+        (notification.model_copy(update={"id": notification.id + 1000}), user) for notification, user in subscriptions
+    ]
+    matcher = matcher_class(subscriptions + duplicates, FeedParser.notification_matches_deal)
+    matches = matcher.matches(deal0)
+
+    assert matcher.group_count == len(subscriptions)
+    assert len(matches) == 2 * len(matcher_class(subscriptions, FeedParser.notification_matches_deal).matches(deal0))
+    assert matcher.stats.evaluations * 2 <= matcher.stats.candidates
+    assert matcher.stats.saved_evaluations >= len(subscriptions)
@@ -0,0 +1,22 @@
+import pytest
+
+from src.matching.price_index import PriceIndex
+from src.models import NotificationModel
+
+
+@pytest.mark.parametrize("amount", [0, 4.99, 5, 10, 15.5, 20, 99.99, 100, 1000])
+def test_price_index_filter(amount: float) -> None:
+    bounds = [(None, None), (5, None), (None, 20), (10, 100), (0, 0), (20, 20), (100, 10)]
+    notifications = [
+        NotificationModel(id=i, search_query="query", min_price=min_price, max_price=max_price, user_id=1)
+        for i, (min_price, max_price) in enumerate(bounds)
+    ]
+
+    expected = [
+        position
+        for position, notification in enumerate(notifications)
+        if not (notification.min_price and (not amount or amount < notification.min_price))
+        and not (amount and notification.max_price and amount > notification.max_price)
+    ]
+
+    assert PriceIndex(notifications).filter(range(len(notifications)), amount) == expected
@@ -0,0 +1,27 @@
+from src.matching.aho_corasick import AhoCorasick
+from src.matching.subscription_index import SubscriptionIndex
+from src.models import DealModel, NotificationModel, UserModel
+from src.rss.feedparser import FeedParser
+
+
+def test_aho_corasick() -> None:
+    automaton = AhoCorasick(["he", "she", "his", "hers", ""])
+
+    assert automaton.search("ushers") == {"she": 4, "he": 4, "hers": 6}
+    assert automaton.search("his") == {"his": 3}
+    assert automaton.search("nothing") == {}
+
+
+def test_candidates_match_like_brute_force(
+    subscriptions: list[tuple[NotificationModel, UserModel]],
+    deals: list[DealModel],
+) -> None:
+    notifications = [notification for notification, _ in subscriptions]
+    index = SubscriptionIndex(notifications)
+
+    for deal in deals:
+        expected = [n for n in notifications if FeedParser.notification_matches_deal(n, deal)]
+        candidates = [notifications[position] for position in index.candidates(deal)]
+
+        assert len(candidates) < len(notifications)
+        assert [n for n in candidates if FeedParser.notification_matches_deal(n, deal)] == expected
@@ -0,0 +1,48 @@
+from collections.abc import Iterator
+
+import pytest
+
+from src.models import DealModel, NotificationModel
+from src.rss.deal_cache import DealCache
+from src.rss.feedparser import FeedParser
+
+
+@pytest.fixture(autouse=True)
+def clear_cache() -> Iterator[None]:
+    DealCache.clear()
+    yield
+    DealCache.clear()
+
+
+def test_deal_key() -> None:
+    assert DealCache.deal_key("https://www.mydealz.de/deals/funko-pop-2520045") == "www.mydealz.de#2520045"
+    assert DealCache.deal_key("https://www.mydealz.de/deals/funko-pop-pocket-2520045/?utm=rss") == (
+        "www.mydealz.de#2520045"
+    )
+    assert DealCache.deal_key("https://www.preisjaeger.at/deals/funko-pop-2520045") == "www.preisjaeger.at#2520045"
+    assert DealCache.deal_key("https://example.com/deal/") == "example.com/deal"
+
+
+def test_reuse_deal_and_matches(deal0: DealModel) -> None:
+    assert DealCache.snapshot() == {}
+
+    DealCache.put(deal0)
+    key = DealCache.deal_key(deal0.link.replace("funko", "funko-pop"))
+    assert DealCache.resolve([key], DealCache.snapshot()) == [deal0]
+
+    evaluated = []
+
+    def match_function(notification: NotificationModel, deal: DealModel) -> bool:
+        evaluated.append(notification.search_query)
+        return FeedParser.notification_matches_deal(notification, deal)
+
+    all_notification = NotificationModel(id=1, search_query="funko", user_id=1)
+    hot_notification = NotificationModel(id=2, search_query="funko", search_hot_only=True, user_id=2)
+    other_notification = NotificationModel(
+        id=3, search_query="star wars", min_price=10, search_hot_only=True, user_id=2
+    )
+
+    assert DealCache.matches(all_notification, deal0, match_function)
+    assert DealCache.matches(hot_notification, deal0, match_function)
+    assert not DealCache.matches(other_notification, deal0, match_function)
+    assert evaluated == ["funko", "star wars"]
@@ -0,0 +1,137 @@
+import asyncio
+import time
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from src import config
+from src.db.outbox_client import OutboxClient
+from src.db.subscription_registry import SubscriptionRegistry
+from src.models import DealModel, NotificationModel, UserModel
+from src.rss.feedparser import FeedParser
+from src.rss.feeds import AbstractFeed, MyDealzAllFeed, MyDealzHotFeed
+from src.telegram.delivery import RateLimiter
+
+
+class FakeBot:
+    def __init__(self) -> None:
+        self.sent: list[tuple[str, int]] = []
+        self.rate_limiter = RateLimiter()
+
+    async def send_deal(self, deal: DealModel, notification: NotificationModel, user: UserModel) -> None:  # noqa: ARG002
+        await asyncio.sleep(0)
+        self.sent.append((deal.title, user.id))
+
+    @classmethod
+    def connection_stats(cls) -> str:
+        return "none"
+
+
+@pytest.mark.usefixtures("database")
+def test_pipeline_queues_fast_feeds_first(
+    monkeypatch: pytest.MonkeyPatch, deal0: DealModel, deal1: DealModel, deal2: DealModel
+) -> None:
+    user = UserModel(id=1)
+    subscriptions = [
+        (NotificationModel(id=1, search_query="funko", user_id=1), user),
+        (NotificationModel(id=2, search_query="pop", user_id=1), user),
+        (NotificationModel(id=3, search_query="skoda", user_id=1), user),
+        (NotificationModel(id=4, search_query="e", search_hot_only=True, user_id=1), user),
+    ]
+    monkeypatch.setattr(SubscriptionRegistry, "snapshot", lambda: (-1, subscriptions))
+    monkeypatch.setattr(SubscriptionRegistry, "subscription", lambda i: subscriptions[i - 1])
+    monkeypatch.setattr(FeedParser, "_matchers_version", None)
+    monkeypatch.setattr(config, "TELEGRAM_CHAT_RATE", 1000)
+
+    async def all_deals() -> list[DealModel]:
+        await asyncio.sleep(0)
+        return [deal0, deal1]
+
+    async def hot_deals() -> list[DealModel]:
+        await asyncio.sleep(0.1)
+        return [deal2]
+
+    monkeypatch.setattr(MyDealzAllFeed, "get_new_deals", all_deals)
+    monkeypatch.setattr(MyDealzHotFeed, "get_new_deals", hot_deals)
+
+    bot = FakeBot()
+    feedparser = FeedParser(bot)  # type: ignore[arg-type]
+    new_deals = asyncio.run(feedparser.parse_feeds([MyDealzHotFeed, MyDealzAllFeed]))
+
+    assert new_deals == {MyDealzAllFeed: 2, MyDealzHotFeed: 1}
+    assert bot.sent == []
+
+    asyncio.run(feedparser.outbox_sender.drain())
+    assert bot.sent == [(deal0.title, 1), (deal1.title, 1), (deal2.title, 1)]
+
+
+@pytest.mark.usefixtures("database")
+def test_pipeline_contains_failing_feed(monkeypatch: pytest.MonkeyPatch, deal0: DealModel) -> None:
+    user = UserModel(id=1)
+    subscriptions = [(NotificationModel(id=1, search_query="funko", user_id=1), user)]
+    monkeypatch.setattr(SubscriptionRegistry, "snapshot", lambda: (-1, subscriptions))
+    monkeypatch.setattr(FeedParser, "_matchers_version", None)
+    monkeypatch.setattr(MyDealzAllFeed, "_seen_items", None)
+
+    async def all_deals() -> list[DealModel]:
+        await asyncio.sleep(0.1)
+        return [deal0]
+
+    async def broken_feed() -> list[DealModel]:
+        await asyncio.sleep(0)
+        msg = "media_content"
+        raise KeyError(msg)
+
+    monkeypatch.setattr(MyDealzAllFeed, "get_new_deals", all_deals)
+    monkeypatch.setattr(MyDealzHotFeed, "get_new_deals", broken_feed)
+
+    feedparser = FeedParser(FakeBot())  # type: ignore[arg-type]
+    new_deals = asyncio.run(feedparser.parse_feeds([MyDealzHotFeed, MyDealzAllFeed]))
+
+    assert new_deals == {MyDealzAllFeed: 1, MyDealzHotFeed: 0}
+    assert deal0.key in MyDealzAllFeed.get_seen_items()
+    assert [entry.user_id for entry in OutboxClient.fetch_pending(10, 1, time.time())] == [1]
+
+
+def test_parser_survives_failing_iterations(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(config, "PARSE_WORKERS", 0)
+    monkeypatch.setattr(config, "REGISTRY_CHECK_INTERVAL", -1)
+    feedparser = FeedParser(FakeBot())  # type: ignore[arg-type]
+    monkeypatch.setattr(feedparser.scheduler, "seconds_until_next_poll", lambda: 0)
+    runs: list[int] = []
+
+    def check_consistency() -> bool:
+        msg = "database is locked"
+        raise OperationalError(msg, None, Exception())
+
+    async def parse_feeds(_: object) -> dict[type[AbstractFeed], int]:
+        await asyncio.sleep(0)
+        runs.append(len(runs))
+        if len(runs) == 3:  # noqa: PLR2004
+            feedparser.exit_event.set()
+        return {}
+
+    monkeypatch.setattr(SubscriptionRegistry, "check_consistency", check_consistency)
+    monkeypatch.setattr(feedparser, "parse_feeds", parse_feeds)
+    asyncio.run(feedparser.run())
+
+    assert runs == [0, 1, 2]
+
+
+def test_exit_stops_outbox_sender_after_crash(monkeypatch: pytest.MonkeyPatch) -> None:
+    feedparser = FeedParser(FakeBot())  # type: ignore[arg-type]
+
+    async def crash() -> None:
+        await asyncio.sleep(0)
+        msg = "crash"
+        raise RuntimeError(msg)
+
+    async def start_and_exit() -> None:
+        await feedparser.start()
+        await asyncio.sleep(0.01)
+        await feedparser.exit()
+
+    monkeypatch.setattr(feedparser, "run", crash)
+    asyncio.run(start_and_exit())
+
+    assert feedparser.outbox_sender._task is None
@@ -0,0 +1,64 @@
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+from feedparser import parse
+
+from src import config
+from src.rss.feeds import MyDealzAllFeed, MyDealzHotFeed
+
+
+def test_conditional_get_validators(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(config, "FILE_DIR", tmp_path)
+    monkeypatch.setattr(MyDealzAllFeed, "_validators", None)
+    monkeypatch.setattr(MyDealzHotFeed, "_validators", None)
+
+    assert MyDealzAllFeed.conditional_headers() == {}
+
+    MyDealzAllFeed.set_validators({"ETag": '"abc"', "Last-Modified": "Sun, 09 Feb 2025 16:59:15 GMT", "Age": "1"})
+    assert MyDealzAllFeed.conditional_headers() == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "Sun, 09 Feb 2025 16:59:15 GMT",
+    }
+    assert MyDealzHotFeed.conditional_headers() == {}
+
+    monkeypatch.setattr(MyDealzAllFeed, "_validators", None)
+    assert MyDealzAllFeed.get_validators() == {"ETag": '"abc"', "Last-Modified": "Sun, 09 Feb 2025 16:59:15 GMT"}
+
+
+@pytest.fixture
+def feed_content() -> bytes:
+    return (Path(__file__).parent / "files" / "mydealz.xml").read_bytes()
+
+
+def test_stream_deals_like_feedparser(feed_content: bytes) -> None:
+    last_update = datetime.min.replace(tzinfo=config.TIMEZONE)
+
+    streamed = list(MyDealzAllFeed.stream_deals(feed_content, last_update))
+    parsed = [MyDealzAllFeed.parse_deal(entry) for entry in parse(feed_content)["entries"]]
+
+    assert len(streamed) == 2  # noqa: PLR2004
+    assert streamed == parsed
+
+
+def test_stream_deals_stops_at_last_update(feed_content: bytes) -> None:
+    last_update = datetime(2025, 2, 9, 17, 0, 0, tzinfo=config.TIMEZONE)
+
+    assert [deal.title for deal in MyDealzAllFeed.stream_deals(feed_content, last_update)] == [
+        "Sony PlayStation 5 Slim Digital"
+    ]
+    assert [deal.title for deal in MyDealzAllFeed.stream_deals(feed_content, datetime.max.replace(tzinfo=UTC))] == []
+    assert MyDealzAllFeed.parse_deals(b"<not-rss/>", last_update) == []
+
+
+def test_stream_deals_skips_seen_keys_with_whitespace(feed_content: bytes) -> None:
+    last_update = datetime.min.replace(tzinfo=config.TIMEZONE)
+    guid = "https://www.mydealz.de/deals/lokal-muller-funko-pop-2520045"
+    padded = feed_content.replace(f">{guid}</guid>".encode(), f">\n  {guid}\n</guid>".encode())
+
+    assert (
+        MyDealzAllFeed.parse_deals(padded, last_update)[1] == MyDealzAllFeed.parse_deals(feed_content, last_update)[1]
+    )
+    assert [deal.title for deal in MyDealzAllFeed.stream_deals(padded, last_update, {guid})] == [
+        "Sony PlayStation 5 Slim Digital"
+    ]
@@ -0,0 +1,45 @@
+import asyncio
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from src import config
+from src.models import DealModel
+from src.rss.deal_cache import DealCache
+from src.rss.feeds import MyDealzAllFeed
+from src.rss.parser_pool import ParserPool
+
+
+def test_parse_in_worker_process(monkeypatch: pytest.MonkeyPatch) -> None:
+    feed_content = (Path(__file__).parent / "files" / "mydealz.xml").read_bytes()
+    horizon = datetime.min.replace(tzinfo=config.TIMEZONE)
+    seen = {"https://www.mydealz.de/deals/sony-playstation-5-slim-2520099"}
+    in_process = asyncio.run(ParserPool.parse_deals(MyDealzAllFeed, feed_content, horizon, seen))
+
+    monkeypatch.setattr(config, "PARSE_WORKERS", 1)
+    ParserPool.start()
+    try:
+        in_worker = asyncio.run(ParserPool.parse_deals(MyDealzAllFeed, feed_content, horizon, seen))
+    finally:
+        ParserPool.shutdown()
+
+    assert [deal.title for deal in in_worker] == ["(Lokal Müller) Funko Pop Pocket 4-Pack"]
+    assert in_worker == in_process
+
+
+def test_reuse_cached_deals_in_worker_process(monkeypatch: pytest.MonkeyPatch, deal0: DealModel) -> None:
+    feed_content = (Path(__file__).parent / "files" / "mydealz.xml").read_bytes()
+    horizon = datetime.min.replace(tzinfo=config.TIMEZONE)
+    DealCache.put(deal0)
+
+    monkeypatch.setattr(config, "PARSE_WORKERS", 1)
+    ParserPool.start()
+    try:
+        deals = asyncio.run(ParserPool.parse_deals(MyDealzAllFeed, feed_content, horizon, ()))
+    finally:
+        ParserPool.shutdown()
+        DealCache.clear()
+
+    assert [deal.title for deal in deals] == ["Sony PlayStation 5 Slim Digital", deal0.title]
+    assert deals[1] is deal0
@@ -0,0 +1,62 @@
+import pytest
+
+from src import config
+from src.rss.feeds import MyDealzAllFeed, MyDealzHotFeed
+from src.rss.scheduler import FeedScheduler
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+    monkeypatch.setattr(config, "PARSE_INTERVAL", 60)
+    monkeypatch.setattr(config, "POLL_MIN_INTERVAL", 30)
+    monkeypatch.setattr(config, "POLL_MAX_INTERVAL", 600)
+    monkeypatch.setattr(config, "POLL_TARGET_DEALS", 2)
+    monkeypatch.setattr(config, "POLL_JITTER", 0)
+
+    return FakeClock()
+
+
+def test_all_feeds_due_on_start(clock: FakeClock) -> None:
+    scheduler = FeedScheduler([MyDealzAllFeed, MyDealzHotFeed], clock)
+
+    assert scheduler.due_feeds() == [MyDealzAllFeed, MyDealzHotFeed]
+    assert scheduler.seconds_until_next_poll() == 0
+
+
+def test_intervals_adapt_to_new_deals(clock: FakeClock) -> None:
+    scheduler = FeedScheduler([MyDealzAllFeed, MyDealzHotFeed], clock)
+    scheduler.record_poll(MyDealzAllFeed, 100)  # first poll doesn't tell the rate
+    scheduler.record_poll(MyDealzHotFeed, 0)
+    assert [schedule.interval for schedule in scheduler.schedule()] == [60, 60]
+
+    for _ in range(10):
+        clock.now += 60
+        for feed in scheduler.due_feeds():
+            scheduler.record_poll(feed, 10 if feed is MyDealzAllFeed else 0)
+
+    schedules = {schedule.feed: schedule for schedule in scheduler.schedule()}
+    assert schedules[MyDealzAllFeed].interval == config.POLL_MIN_INTERVAL
+    assert schedules[MyDealzHotFeed].interval == config.POLL_MAX_INTERVAL
+
+    clock.now += 30
+    assert scheduler.due_feeds() == [MyDealzAllFeed]
+    assert scheduler.seconds_until_next_poll() == 0
+    scheduler.record_poll(MyDealzAllFeed, 1)
+    assert scheduler.seconds_until_next_poll() == config.POLL_MIN_INTERVAL
+
+
+def test_jitter(clock: FakeClock, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(config, "POLL_JITTER", 0.1)
+    scheduler = FeedScheduler([MyDealzAllFeed], clock)
+
+    for _ in range(20):
+        scheduler.record_poll(MyDealzAllFeed, 0)
+        assert 54 <= scheduler.seconds_until_next_poll() <= 66  # noqa: PLR2004
@@ -0,0 +1,104 @@
+import asyncio
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from src import config
+from src.db.outbox_client import OutboxClient
+from src.db.seen_item_client import SeenItemClient
+from src.models import DealModel, NotificationModel, SeenItemModel, UserModel
+from src.rss.feeds import MyDealzAllFeed
+from src.rss.seen_items import SeenItems
+from src.telegram.outbox_sender import OutboxSender
+
+PUBLISHED = datetime(2025, 2, 9, 17, 0, 0, tzinfo=config.TIMEZONE)
+
+pytestmark = pytest.mark.usefixtures("database")
+
+
+def test_seen_items_persist(monkeypatch: pytest.MonkeyPatch) -> None:
+    seen_items = SeenItems("feed")
+    assert seen_items.horizon(60) is None
+
+    seen_items.add("a", PUBLISHED)
+    seen_items.add("b", PUBLISHED - timedelta(hours=1))
+    assert "a" in seen_items
+    assert SeenItemClient.fetch_by_feed("feed") == []
+
+    seen_items.flush()
+    reloaded = SeenItems("feed")
+    assert [key for key in ("a", "b", "c") if key in reloaded] == ["a", "b"]
+    assert reloaded.horizon(60) == PUBLISHED - timedelta(seconds=60)
+    assert len(SeenItems("other")) == 0
+
+    monkeypatch.setattr(config, "SEEN_ITEMS_MAX", 2)
+    reloaded.add("c", PUBLISHED)
+    reloaded.flush()
+    assert [item.guid for item in SeenItemClient.fetch_by_feed("feed")] == ["b", "c"]
+
+
+def test_seen_items_expire(monkeypatch: pytest.MonkeyPatch) -> None:
+    seen_items = SeenItems("feed")
+    seen_items.add("a", PUBLISHED)
+    seen_items.flush()
+
+    monkeypatch.setattr(config, "SEEN_ITEMS_TTL", -1)
+    assert len(SeenItems("feed")) == 0
+
+
+def test_parse_feed_skips_seen_deals(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(MyDealzAllFeed, "_last_update", None)
+    monkeypatch.setattr(MyDealzAllFeed, "_seen_items", None)
+    feed_content = (Path(__file__).parent / "files" / "mydealz.xml").read_bytes()
+
+    deals = asyncio.run(MyDealzAllFeed.parse_feed(feed_content))
+    assert [deal.title for deal in deals] == [
+        "Sony PlayStation 5 Slim Digital",
+        "(Lokal Müller) Funko Pop Pocket 4-Pack",
+    ]
+
+    # Deals are only marked as seen when they are saved with their outbox entries after matching
+    assert asyncio.run(MyDealzAllFeed.parse_feed(feed_content)) == deals
+    assert SeenItemClient.fetch_by_feed(MyDealzAllFeed.__name__) == []
+    MyDealzAllFeed.get_seen_items().flush(deals)
+    assert asyncio.run(MyDealzAllFeed.parse_feed(feed_content)) == []
+
+    # A deal published before the newest seen deal, but within the grace period, is still new
+    monkeypatch.setattr(config, "SEEN_ITEMS_GRACE", 7200)
+    late_item = feed_content.replace(b"2520045", b"2520046")
+    late_deals = asyncio.run(MyDealzAllFeed.parse_feed(late_item))
+    assert [deal.link for deal in late_deals] == ["https://www.mydealz.de/deals/lokal-muller-funko-pop-2520046"]
+    MyDealzAllFeed.get_seen_items().flush(late_deals)
+
+    monkeypatch.setattr(MyDealzAllFeed, "_seen_items", None)
+    assert asyncio.run(MyDealzAllFeed.parse_feed(late_item)) == []
+
+
+def test_seen_items_flush_with_outbox(deal0: DealModel) -> None:
+    seen_items = SeenItems("feed")
+    entry = OutboxSender.entry(deal0, NotificationModel(id=1, search_query="deal", user_id=1), UserModel(id=1))
+
+    assert seen_items.flush([deal0], [entry]) == 1
+    assert deal0.key in seen_items
+    assert [item.guid for item in SeenItemClient.fetch_by_feed("feed")] == [deal0.key]
+    assert [pending.key for pending in OutboxClient.fetch_pending(10, 1, PUBLISHED.timestamp())] == [entry.key]
+    assert seen_items.flush([deal0], [entry]) == 0
+
+
+def test_load_seen_items_in_database_thread(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(MyDealzAllFeed, "_seen_items", None)
+    threads = []
+    fetch_by_feed = SeenItemClient.fetch_by_feed
+
+    def fetch_in_thread(feed: str) -> list[SeenItemModel]:
+        threads.append(threading.current_thread().name)
+        return fetch_by_feed(feed)
+
+    monkeypatch.setattr(SeenItemClient, "fetch_by_feed", fetch_in_thread)
+    seen_items = asyncio.run(MyDealzAllFeed.load_seen_items())
+
+    assert MyDealzAllFeed.get_seen_items() is seen_items
+    assert len(threads) == 1
+    assert threads[0].startswith("db")
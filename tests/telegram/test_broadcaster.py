@@ -0,0 +1,119 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from aiogram.exceptions import TelegramForbiddenError
+from aiogram.methods import CopyMessage
+
+from src import config
+from src.db.broadcast_client import BroadcastClient
+from src.db.user_client import UserClient
+from src.models import RecipientStatus, UserModel
+from src.telegram.broadcaster import Broadcaster
+from src.telegram.delivery import RateLimiter
+
+ADMIN_ID = 1000
+
+
+class FakeBot:
+    def __init__(self, blocked: set[int]) -> None:
+        self.blocked = blocked
+        self.copied: list[int] = []
+        self.progress: list[str] = []
+
+    async def copy_message(self, chat_id: int, from_chat_id: int, message_id: int, **_: object) -> None:
+        await asyncio.sleep(0)
+        if chat_id in self.blocked:
+            raise TelegramForbiddenError(
+                CopyMessage(chat_id=chat_id, from_chat_id=from_chat_id, message_id=message_id),
+                "Forbidden: bot was blocked by the user",
+            )
+        self.copied.append(chat_id)
+
+    async def send_message(self, chat_id: int, text: str) -> SimpleNamespace:  # noqa: ARG002
+        self.progress.append(text)
+
+        return SimpleNamespace(message_id=1)
+
+    async def edit_message_text(self, text: str, chat_id: int, message_id: int) -> None:  # noqa: ARG002
+        self.progress.append(text)
+
+
+class HangingBot(FakeBot):
+    def __init__(self, blocked: set[int]) -> None:
+        super().__init__(blocked)
+        self.hanging = asyncio.Event()
+
+    async def copy_message(self, chat_id: int, from_chat_id: int, message_id: int, **kwargs: object) -> None:
+        if chat_id == 2:  # noqa: PLR2004
+            self.hanging.set()
+            await asyncio.Event().wait()
+        await super().copy_message(chat_id, from_chat_id, message_id, **kwargs)
+
+
+@pytest.fixture(autouse=True)
+def users(database: None, monkeypatch: pytest.MonkeyPatch) -> None:  # noqa: ARG001
+    monkeypatch.setattr(config, "OWN_ID", ADMIN_ID)
+    monkeypatch.setattr(config, "BROADCAST_BATCH_SIZE", 2)
+    monkeypatch.setattr(config, "TELEGRAM_CHAT_RATE", 1000)
+    for user_id in range(1, 7):
+        UserClient.add(UserModel(id=user_id, active=user_id != 6))  # noqa: PLR2004
+
+
+def test_broadcast() -> None:
+    bot = FakeBot(blocked={3})
+
+    async def broadcast() -> None:
+        await Broadcaster.start(bot, RateLimiter(), message_id=42)  # type: ignore[arg-type]
+        await asyncio.gather(*Broadcaster._tasks)
+
+    asyncio.run(broadcast())
+
+    assert sorted(bot.copied) == [1, 2, 4, 5]
+    assert not UserClient.fetch(3).active
+    assert bot.progress[0].startswith("Broadcast läuft")
+    assert "Gesendet: 4/5" in bot.progress[-1]
+
+
+def test_broadcast_saves_every_recipient(monkeypatch: pytest.MonkeyPatch) -> None:
+    # With one sender, the second recipient is sent after the result of the first was saved
+    monkeypatch.setattr(config, "PIPELINE_SENDERS", 1)
+    bot = HangingBot(blocked=set())
+
+    async def interrupted_broadcast() -> int:
+        broadcast = await Broadcaster.start(bot, RateLimiter(), message_id=42)  # type: ignore[arg-type]
+        await bot.hanging.wait()
+        await Broadcaster.exit()
+
+        return broadcast.id
+
+    broadcast_id = asyncio.run(interrupted_broadcast())
+
+    assert bot.copied == [1]
+    assert BroadcastClient.count_recipients(broadcast_id)[RecipientStatus.SENT] == 1
+    assert BroadcastClient.count_recipients(broadcast_id)[RecipientStatus.PENDING] == 4  # noqa: PLR2004
+
+
+def test_resume_broadcast() -> None:
+    broadcast = BroadcastClient.create(42)
+    BroadcastClient.set_progress_message(broadcast, 1)
+    BroadcastClient.save_results(broadcast.id, {1: RecipientStatus.SENT, 2: RecipientStatus.SENT})
+
+    bot = FakeBot(blocked={3})
+
+    async def resume() -> None:
+        await Broadcaster.resume(bot, RateLimiter())  # type: ignore[arg-type]
+        await asyncio.gather(*Broadcaster._tasks)
+
+    asyncio.run(resume())
+
+    assert bot.copied == [4, 5]
+    assert not UserClient.fetch(3).active
+    assert BroadcastClient.fetch_unfinished() == []
+    assert BroadcastClient.count_recipients(broadcast.id) == {
+        RecipientStatus.PENDING: 0,
+        RecipientStatus.SENT: 4,
+        RecipientStatus.FAILED: 0,
+        RecipientStatus.BLOCKED: 1,
+    }
+    assert bot.progress[-1].startswith("Broadcast abgeschlossen.")
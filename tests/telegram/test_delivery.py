@@ -0,0 +1,80 @@
+import asyncio
+
+import pytest
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import SendMessage
+
+from src import config
+from src.telegram.delivery import DeliveryQueue, NotificationCap, RateLimiter, TokenBucket
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_token_bucket() -> None:
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, capacity=2, clock=clock)
+
+    for _ in range(2):
+        assert bucket.delay() == 0
+        bucket.take()
+    assert bucket.delay() == pytest.approx(0.5)
+
+    clock.now += 0.5
+    assert bucket.delay() == 0
+
+    bucket.pause(3)
+    assert bucket.delay() == pytest.approx(3)
+
+
+def test_notification_cap() -> None:
+    clock = FakeClock()
+    cap = NotificationCap(cap=2, window=60, clock=clock)
+
+    assert cap.remaining(1) == 2  # noqa: PLR2004
+    cap.record(1)
+    clock.now += 30
+    cap.record(1)
+    assert cap.remaining(1) == 0
+    assert cap.remaining(2) == 2  # noqa: PLR2004
+
+    clock.now += 30
+    assert cap.remaining(1) == 1
+
+
+def test_delivery_queue_keeps_chat_order_and_retries(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(config, "TELEGRAM_GLOBAL_RATE", 1000)
+    monkeypatch.setattr(config, "TELEGRAM_CHAT_RATE", 1000)
+    sent: list[tuple[int, int]] = []
+    flood_waits = {(2, 0)}
+
+    async def send(item: tuple[int, int]) -> None:
+        await asyncio.sleep(0)
+        if item in flood_waits:
+            flood_waits.remove(item)
+            raise TelegramRetryAfter(SendMessage(chat_id=item[0], text=""), "Flood control exceeded", retry_after=0)
+        sent.append(item)
+
+    async def deliver() -> DeliveryQueue[tuple[int, int]]:
+        queue: DeliveryQueue[tuple[int, int]] = DeliveryQueue(send, RateLimiter(), max_size=2)
+        workers = asyncio.create_task(queue.run(workers=3))
+        for number in range(3):
+            for chat_id in (1, 2, 3):
+                await queue.put(chat_id, (chat_id, number))
+        queue.close()
+        await workers
+
+        return queue
+
+    queue = asyncio.run(deliver())
+
+    assert sorted(sent) == [(chat_id, number) for chat_id in (1, 2, 3) for number in range(3)]
+    for chat_id in (1, 2, 3):
+        assert [number for chat, number in sent if chat == chat_id] == [0, 1, 2]
+    assert queue.stats.sent == 9  # noqa: PLR2004
+    assert queue.stats.retries == 1
@@ -0,0 +1,45 @@
+import asyncio
+from collections.abc import Iterator
+
+import pytest
+
+from src import config
+from src.telegram.image_cache import ImageCache
+
+IMAGE_URL = "https://static.mydealz.de/threads/raw/default/2520045_1/re/768x768/qt/60/2520045_1.jpg"
+
+
+@pytest.fixture(autouse=True)
+def clear_cache() -> Iterator[None]:
+    ImageCache.clear()
+    yield
+    ImageCache.clear()
+
+
+def test_upload_once() -> None:
+    uploads: list[str] = []
+
+    async def send() -> str | None:
+        photo = await ImageCache.acquire(IMAGE_URL)
+        if photo == IMAGE_URL:
+            await asyncio.sleep(0.01)
+            uploads.append(photo)
+            ImageCache.release(IMAGE_URL, "file-id")
+
+        return photo
+
+    async def send_all() -> list[str | None]:
+        return await asyncio.gather(*(send() for _ in range(5)))
+
+    assert asyncio.run(send_all()) == [IMAGE_URL] + ["file-id"] * 4
+    assert uploads == [IMAGE_URL]
+
+
+def test_unusable_and_expired_images(monkeypatch: pytest.MonkeyPatch) -> None:
+    assert asyncio.run(ImageCache.acquire(IMAGE_URL)) == IMAGE_URL
+    ImageCache.mark_unusable(IMAGE_URL)
+    ImageCache.release(IMAGE_URL)
+    assert asyncio.run(ImageCache.acquire(IMAGE_URL)) is None
+
+    monkeypatch.setattr(config, "IMAGE_CACHE_TTL", -1)
+    assert asyncio.run(ImageCache.acquire(IMAGE_URL)) == IMAGE_URL
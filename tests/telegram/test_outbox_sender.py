@@ -0,0 +1,160 @@
+import asyncio
+import time
+
+import pytest
+from aiogram.exceptions import TelegramNetworkError
+from aiogram.methods import SendMessage
+
+from src import config
+from src.db.outbox_client import OutboxClient
+from src.db.subscription_registry import SubscriptionRegistry
+from src.models import DealModel, NotificationModel, UserModel
+from src.telegram.delivery import RateLimiter
+from src.telegram.messages import Messages
+from src.telegram.outbox_sender import OutboxSender
+
+pytestmark = pytest.mark.usefixtures("database")
+
+
+class FlakyBot:
+    def __init__(self, failing_users: set[int]) -> None:
+        self.failing_users = failing_users
+        self.rate_limiter = RateLimiter()
+        self.sent: list[tuple[str, int]] = []
+
+    async def send_deal(self, deal: DealModel, notification: NotificationModel, user: UserModel) -> None:  # noqa: ARG002
+        await asyncio.sleep(0)
+        if user.id in self.failing_users:
+            raise TelegramNetworkError(SendMessage(chat_id=user.id, text=""), "Request timeout error")
+        self.sent.append((deal.title, user.id))
+
+    async def send_digest(self, user: UserModel, deals: list[tuple[DealModel, NotificationModel]]) -> None:
+        await asyncio.sleep(0)
+        self.sent.extend((message, user.id) for message in Messages.deal_digest(deals))
+
+
+@pytest.fixture
+def subscriptions(monkeypatch: pytest.MonkeyPatch) -> dict[int, tuple[NotificationModel, UserModel]]:
+    monkeypatch.setattr(config, "TELEGRAM_CHAT_RATE", 1000)
+    subscriptions = {
+        user_id: (NotificationModel(id=user_id, search_query="deal", user_id=user_id), UserModel(id=user_id))
+        for user_id in (1, 2, 3)
+    }
+    monkeypatch.setattr(SubscriptionRegistry, "subscription", subscriptions.get)
+
+    return subscriptions
+
+
+def test_outbox_is_idempotent(
+    subscriptions: dict[int, tuple[NotificationModel, UserModel]], deal0: DealModel, deal1: DealModel
+) -> None:
+    entries = [OutboxSender.entry(deal, *subscriptions[1]) for deal in (deal0, deal1)]
+    assert OutboxClient.add_all(entries) == 2  # noqa: PLR2004
+    assert OutboxClient.add_all(entries) == 0
+
+    bot = FlakyBot(set())
+    stats = asyncio.run(OutboxSender(bot).drain())  # type: ignore[arg-type]
+    assert stats.sent == 2  # noqa: PLR2004
+    assert bot.sent == [(deal0.title, 1), (deal1.title, 1)]
+
+    assert OutboxClient.add_all(entries) == 0
+    assert asyncio.run(OutboxSender(bot).drain()).sent == 0  # type: ignore[arg-type]
+
+    OutboxClient.purge(time.time() + 1, config.OUTBOX_MAX_ATTEMPTS)
+    assert OutboxClient.add_all(entries) == 2  # noqa: PLR2004
+
+
+def test_outbox_queues_deal_per_notification(
+    subscriptions: dict[int, tuple[NotificationModel, UserModel]], deal0: DealModel
+) -> None:
+    notification, user = subscriptions[1]
+    hot_notification = NotificationModel(id=4, search_query="deal", search_hot_only=True, user_id=user.id)
+    subscriptions[hot_notification.id] = (hot_notification, user)
+
+    assert OutboxClient.add_all([OutboxSender.entry(deal0, notification, user)]) == 1
+    assert asyncio.run(OutboxSender(FlakyBot(set())).drain()).sent == 1  # type: ignore[arg-type]
+
+    # The deal became hot after it was sent from the feed of all deals
+    assert OutboxClient.add_all([OutboxSender.entry(deal0, hot_notification, user)]) == 1
+    assert OutboxClient.add_all([OutboxSender.entry(deal0, notification, user)]) == 0
+
+
+def test_outbox_retries_and_drops(
+    monkeypatch: pytest.MonkeyPatch, subscriptions: dict[int, tuple[NotificationModel, UserModel]], deal0: DealModel
+) -> None:
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now)
+    OutboxClient.add_all([OutboxSender.entry(deal0, *subscriptions[user_id]) for user_id in (1, 2, 3)])
+    del subscriptions[3]  # notification was deleted
+
+    bot = FlakyBot({2})
+    outbox_sender = OutboxSender(bot)  # type: ignore[arg-type]
+    for attempt in range(config.OUTBOX_MAX_ATTEMPTS):
+        assert asyncio.run(outbox_sender.drain()).failed == 1
+
+        [entry] = OutboxClient.fetch_pending(10, config.OUTBOX_MAX_ATTEMPTS + 1, now + 86400)
+        assert entry.user_id == 2  # noqa: PLR2004
+        assert entry.sent_at is None
+        assert entry.attempts == attempt + 1
+        assert entry.next_attempt_at == now + config.OUTBOX_RETRY_DELAY * 2**attempt
+        assert OutboxClient.fetch_pending(10, config.OUTBOX_MAX_ATTEMPTS, now) == []
+        now = entry.next_attempt_at
+
+    assert bot.sent == [(deal0.title, 1)]
+    assert asyncio.run(outbox_sender.drain()).failed == 0
+    assert OutboxClient.fetch_pending(10, config.OUTBOX_MAX_ATTEMPTS, now + 86400) == []
+
+    # Entries that ran out of attempts are purged after OUTBOX_RETENTION
+    assert len(OutboxClient.fetch_pending(10, config.OUTBOX_MAX_ATTEMPTS + 1, now)) == 1
+    now += config.OUTBOX_RETENTION
+    asyncio.run(outbox_sender.drain())
+    assert OutboxClient.fetch_pending(10, config.OUTBOX_MAX_ATTEMPTS + 1, now) == []
+
+
+def test_outbox_keeps_failed_entries_pending(
+    subscriptions: dict[int, tuple[NotificationModel, UserModel]], deal0: DealModel
+) -> None:
+    OutboxClient.add_all([OutboxSender.entry(deal0, *subscriptions[1])])
+
+    outbox_sender = OutboxSender(FlakyBot({1}))  # type: ignore[arg-type]
+    stats = asyncio.run(outbox_sender.drain())
+
+    assert stats.sent == 0
+    assert stats.failed == 1
+    assert outbox_sender.notification_cap.remaining(1) == config.NOTIFICATION_CAP
+    [entry] = OutboxClient.fetch_pending(10, config.OUTBOX_MAX_ATTEMPTS, time.time() + config.OUTBOX_RETRY_DELAY)
+    assert entry.sent_at is None
+    assert entry.attempts == 1
+
+
+def test_outbox_sends_digest_above_cap(
+    monkeypatch: pytest.MonkeyPatch,
+    subscriptions: dict[int, tuple[NotificationModel, UserModel]],
+    deal0: DealModel,
+    deal1: DealModel,
+    deal2: DealModel,
+    deal3: DealModel,
+    deal4: DealModel,
+) -> None:
+    monkeypatch.setattr(config, "NOTIFICATION_CAP", 1)
+    notification, user = subscriptions[1]
+    OutboxClient.add_all([OutboxSender.entry(deal, notification, user) for deal in (deal0, deal1, deal2)])
+
+    bot = FlakyBot(set())
+    outbox_sender = OutboxSender(bot)  # type: ignore[arg-type]
+    assert asyncio.run(outbox_sender.drain()).sent == 2  # noqa: PLR2004
+    assert bot.sent == [(deal0.title, 1), (*Messages.deal_digest([(deal1, notification), (deal2, notification)]), 1)]
+
+    OutboxClient.add_all([OutboxSender.entry(deal3, notification, user), OutboxSender.entry(deal4, notification, user)])
+    asyncio.run(outbox_sender.drain())
+    assert bot.sent[-1] == (*Messages.deal_digest([(deal3, notification), (deal4, notification)]), 1)
+
+
+def test_digest_length(deal0: DealModel) -> None:
+    notification = NotificationModel(id=1, search_query="funko", user_id=1)
+    messages = Messages.deal_digest([(deal0, notification)] * 100)
+
+    assert len(messages) > 1
+    assert messages[0].startswith("100 weitere neue Deals:")
+    assert all(len(message) <= 4096 for message in messages)  # noqa: PLR2004
+    assert sum(message.count(deal0.link) for message in messages) == 100  # noqa: PLR2004
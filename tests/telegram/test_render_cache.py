@@ -0,0 +1,36 @@
+from collections.abc import Iterator
+
+import pytest
+
+from src.models import DealModel, NotificationModel
+from src.telegram.messages import Messages
+from src.telegram.render_cache import RenderCache
+
+
+@pytest.fixture(autouse=True)
+def clear_cache() -> Iterator[None]:
+    RenderCache.clear()
+    yield
+    RenderCache.clear()
+
+
+def test_render_once(deal0: DealModel) -> None:
+    notification = NotificationModel(id=1, search_query="funko", user_id=1)
+    other_user = NotificationModel(id=2, search_query="funko", user_id=2)
+
+    message = RenderCache.deal_msg(deal0, notification)
+    assert message == Messages.deal_msg(deal0, notification)
+    assert RenderCache.deal_msg(deal0.model_copy(), other_user) is message
+
+    keyboard = RenderCache.deal_kb(deal0, notification)
+    assert RenderCache.deal_kb(deal0, notification) is keyboard
+    assert RenderCache.deal_kb(deal0, other_user) is not keyboard
+
+
+def test_render_changed_deal(deal0: DealModel) -> None:
+    notification = NotificationModel(id=1, search_query="funko", user_id=1)
+    RenderCache.deal_msg(deal0, notification)
+
+    deal0.price.amount += 1
+    assert RenderCache.deal_msg(deal0, notification) == Messages.deal_msg(deal0, notification)
+    assert f"{deal0.price.amount:.2f}" in RenderCache.deal_msg(deal0, notification)
@@ -1,5 +1,7 @@
+import pytest
+
 from src.models import DealModel
-from src.queries import Queries
+from src.queries import Queries, QueriesCache
 from src.utils import prettify_query
 
 
@@ -36,3 +38,29 @@ def test_queries(
     assert Queries(prettify_query(" Pentax+ ")).any_match(deal5.search_title)
 
     assert not Queries(prettify_query("Neu+")).any_match(deal1.search_title)
+
+
+def test_queries_cache() -> None:
+    QueriesCache.clear()
+
+    queries = QueriesCache.get(1, "ps5")
+    assert QueriesCache.get(1, "ps5") is queries
+    assert QueriesCache.get(1, "ps5 & slim") is not queries
+    assert QueriesCache.get(None, "ps5") is not QueriesCache.get(None, "ps5")
+
+    QueriesCache.invalidate(1)
+    assert QueriesCache.get(1, "ps5") is not queries
+
+
+def test_queries_cache_eviction(monkeypatch: pytest.MonkeyPatch) -> None:
+    QueriesCache.clear()
+    monkeypatch.setattr(QueriesCache, "_max_size", 2)
+
+    first = QueriesCache.get(1, "a")
+    QueriesCache.get(2, "b")
+    assert QueriesCache.get(1, "a") is first
+    QueriesCache.get(3, "c")
+
+    assert QueriesCache.get(1, "a") is first
+    assert len(QueriesCache._cache) == 2  # noqa: PLR2004
+    assert 2 not in QueriesCache._cache  # noqa: PLR2004